@@ -0,0 +1,198 @@
+"""Artifacts of failed tests, collected off the critical path of passing ones.
+
+Every page the driver fixtures open gets a small recorder injected ahead of the app's own scripts
+(`Page.addScriptToEvaluateOnNewDocument`). It keeps the most recent console messages, uncaught errors and
+fetch/XHR requests in ring buffers inside the page, and nothing is read back while tests pass. When a test fails,
+its report hook takes a screenshot, the DOM and the buffers in two WebDriver calls and hands them to a background
+thread, which writes them gzip-compressed to `<directory>/<test>/` while the next test runs.
+"""
+
+import gzip
+import json
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from _pytest.reports import TestReport
+from _pytest.runner import CallInfo
+from _pytest.terminal import TerminalReporter
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+DRIVER_KEY = pytest.StashKey[WebDriver]()
+
+BUFFER_SIZE = 200
+
+# Names the injected recorder in stack traces, so that its console wrapper can be told apart from the app's code.
+RECORDER_SOURCE_URL = 'weather-e2e-recorder.js'
+
+RECORDER_SCRIPT = """
+(() => {
+	const size = %d;
+	const recorder = window.__e2eRecorder = {console: [], network: []};
+	const push = (buffer, entry) => {
+		buffer.push({time: Math.round(performance.now()), ...entry});
+		if (buffer.length > size) {
+			buffer.shift();
+		}
+	};
+	const describe = value => {
+		if (value instanceof Error) {
+			return value.stack || String(value);
+		}
+		try {
+			return typeof value === 'string' ? value : JSON.stringify(value);
+		} catch (e) {
+			return String(value);
+		}
+	};
+
+	for (const level of ['debug', 'log', 'info', 'warn', 'error']) {
+		const original = console[level];
+		console[level] = (...args) => {
+			push(recorder.console, {level, message: args.map(describe).join(' ')});
+			return original.apply(console, args);
+		};
+	}
+	window.addEventListener('error', event => push(recorder.console, {
+		level: 'exception', message: describe(event.error || event.message), source: event.filename,
+	}));
+	window.addEventListener('unhandledrejection', event => push(recorder.console, {
+		level: 'exception', message: 'Unhandled rejection: ' + describe(event.reason),
+	}));
+
+	const originalFetch = window.fetch;
+	window.fetch = (...args) => {
+		const started = performance.now();
+		const [input, init] = args;
+		const entry = {
+			kind: 'fetch',
+			method: (init && init.method) || (input instanceof Request ? input.method : 'GET'),
+			url: input instanceof Request ? input.url : String(input),
+		};
+		const done = outcome => push(recorder.network, {
+			...entry, ...outcome, ms: Math.round(performance.now() - started),
+		});
+		return originalFetch(...args).then(
+			response => {
+				done({status: response.status});
+				return response;
+			},
+			error => {
+				done({error: describe(error)});
+				throw error;
+			},
+		);
+	};
+
+	const open = XMLHttpRequest.prototype.open;
+	const send = XMLHttpRequest.prototype.send;
+	XMLHttpRequest.prototype.open = function (method, url, ...rest) {
+		this.__e2eEntry = {kind: 'xhr', method, url: String(url)};
+		return open.call(this, method, url, ...rest);
+	};
+	XMLHttpRequest.prototype.send = function (...args) {
+		const started = performance.now();
+		this.addEventListener('loadend', () => push(recorder.network, {
+			...this.__e2eEntry, status: this.status, ms: Math.round(performance.now() - started),
+		}));
+		return send.apply(this, args);
+	};
+})();
+//# sourceURL=%s
+""" % (BUFFER_SIZE, RECORDER_SOURCE_URL)
+
+_READ_SCRIPT = """
+return {
+	url: location.href,
+	dom: document.documentElement.outerHTML,
+	recorder: window.__e2eRecorder || null,
+	resources: performance.getEntriesByType('resource').map(entry => ({
+		name: entry.name,
+		initiatorType: entry.initiatorType,
+		startTime: Math.round(entry.startTime),
+		duration: Math.round(entry.duration),
+		transferSize: entry.transferSize,
+	})),
+};
+"""
+
+
+def install(driver: WebDriver) -> None:
+	"""Inject the recorder into every document the driver's current page loads from now on."""
+	driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': RECORDER_SCRIPT})
+
+
+def _directory_name(nodeid: str) -> str:
+	return re.sub(r'[^\w.-]+', '_', nodeid).strip('_')[:200]
+
+
+def _write(directory: Path, capture: dict) -> None:
+	directory.mkdir(parents=True, exist_ok=True)
+	if capture.get('screenshot'):
+		# PNG is compressed already.
+		(directory / 'screenshot.png').write_bytes(capture['screenshot'])
+
+	page = capture.get('page') or {}
+	recorder = page.get('recorder') or {}
+	files = {
+		'report.json': {key: capture[key] for key in ('nodeid', 'when', 'failed_at', 'error', 'longrepr')},
+		'console.json': recorder.get('console', []),
+		'network.json': {'requests': recorder.get('network', []), 'resources': page.get('resources', [])},
+	}
+	for name, content in files.items():
+		with gzip.open(directory / f'{name}.gz', 'wt', encoding='utf-8') as file:
+			json.dump(content, file, indent='\t')
+	if 'dom' in page:
+		with gzip.open(directory / 'dom.html.gz', 'wt', encoding='utf-8') as file:
+			file.write(f"<!-- {page['url']} -->\n{page['dom']}")
+
+
+class FailureArtifacts:
+	"""pytest plugin: captures the failing test's page and writes it from a background thread."""
+
+	def __init__(self, directory: str) -> None:
+		self.directory = Path(directory)
+		self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='failure-artifacts')
+		self.pending: list[tuple[Path, Future]] = []
+
+	def capture(self, driver: WebDriver, report: TestReport) -> dict:
+		capture = {
+			'nodeid': report.nodeid,
+			'when': report.when,
+			'failed_at': time.time(),
+			'error': None,
+			'longrepr': str(report.longrepr),
+		}
+		try:
+			capture['screenshot'] = driver.get_screenshot_as_png()
+			capture['page'] = driver.execute_script(_READ_SCRIPT)
+		except WebDriverException as e:
+			capture['error'] = f"{type(e).__name__}: {e.msg}"
+
+		return capture
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_makereport(self, item: pytest.Item, call: CallInfo) -> TestReport:
+		report = yield
+		driver = item.stash.get(DRIVER_KEY, None)
+		if report.failed and report.when == 'call' and driver is not None:
+			directory = self.directory / _directory_name(item.nodeid)
+			self.pending.append((directory, self.executor.submit(_write, directory, self.capture(driver, report))))
+			report.sections.append(('failure artifacts', str(directory)))
+
+		return report
+
+	def pytest_sessionfinish(self) -> None:
+		self.executor.shutdown(wait=True)
+
+	def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+		if not self.pending:
+			return
+
+		terminalreporter.section('failure artifacts')
+		for directory, future in self.pending:
+			error = future.exception()
+			terminalreporter.write_line(f"{directory}" + (f" (not written: {error})" if error else ''))
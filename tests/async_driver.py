@@ -0,0 +1,230 @@
+"""Async DevTools driver that runs many tabs of one Chrome concurrently.
+
+Every tab lives in its own browser context, so scenarios stay as isolated as the WebDriver fixtures make them,
+but while one tab waits for its DOM condition the others keep working:
+
+    async with async_driver.connect(websocket_url) as browser:
+        async with trio.open_nursery() as nursery:
+            for scenario in scenarios:
+                nursery.start_soon(scenario, browser)
+"""
+
+import itertools
+import json
+import math
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import trio
+import trio_websocket
+from selenium.common import JavascriptException, TimeoutException, WebDriverException
+
+from tests.contexts import PERMISSION_SETTINGS
+from tests.selectors import WAIT_FOR_FUNCTION
+
+# Upper bound for one DevTools round trip; commands that wait in the page get their own wait on top of it.
+COMMAND_TIMEOUT_SECONDS = 30
+
+_EVALUATE_WAIT = "new Promise(done => ({function})({predicate}, {timeout_ms}, done))"
+
+_DOCUMENT_PARSED = "location.href !== 'about:blank' && document.readyState !== 'loading'"
+
+_ELEMENT = "document.evaluate({xpath}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+
+_FILL_SCRIPT = """
+(() => {{
+	const input = {element};
+	if (!input) {{
+		return false;
+	}}
+	input.focus();
+	input.select();
+	return true;
+}})()
+"""
+
+_CLICK_SCRIPT = """
+(() => {{
+	const element = {element};
+	if (!element) {{
+		return false;
+	}}
+	element.click();
+	return true;
+}})()
+"""
+
+
+class AsyncDevTools:
+	def __init__(self, ws: trio_websocket.WebSocketConnection) -> None:
+		self._ws = ws
+		self._ids = itertools.count(1)
+		self._pending: dict[int, trio.Event] = {}
+		self._replies: dict[int, dict] = {}
+		self._listeners: dict[tuple[str, str | None], list[trio.MemorySendChannel]] = {}
+
+	async def send(
+			self,
+			method: str,
+			params: dict | None = None,
+			session_id: str | None = None,
+			timeout: float = COMMAND_TIMEOUT_SECONDS,
+	) -> dict:
+		message_id = next(self._ids)
+		message = {'id': message_id, 'method': method, 'params': params or {}}
+		if session_id:
+			message['sessionId'] = session_id
+
+		replied = self._pending[message_id] = trio.Event()
+		try:
+			with trio.fail_after(timeout):
+				await self._ws.send_message(json.dumps(message))
+				await replied.wait()
+		except trio.TooSlowError:
+			self._pending.pop(message_id, None)
+			self._replies.pop(message_id, None)
+			raise
+
+		reply = self._replies.pop(message_id)
+		if 'error' in reply:
+			raise WebDriverException(f"{method} failed: {reply['error'].get('message')}")
+		return reply.get('result', {})
+
+	def listen(self, method: str, session_id: str | None = None) -> trio.MemoryReceiveChannel:
+		"""Channel of the `params` of every `method` event (of one attached target when `session_id` is given)."""
+		send, receive = trio.open_memory_channel(math.inf)
+		self._listeners.setdefault((method, session_id), []).append(send)
+		return receive
+
+	async def read_replies(self) -> None:
+		try:
+			while True:
+				message = json.loads(await self._ws.get_message())
+				if 'id' not in message:
+					listeners = self._listeners.get((message.get('method'), message.get('sessionId')), [])
+					for listener in list(listeners):
+						try:
+							listener.send_nowait(message.get('params', {}))
+						except trio.BrokenResourceError:
+							listeners.remove(listener)
+					continue
+
+				replied = self._pending.pop(message['id'], None)
+				if replied is not None:
+					self._replies[message['id']] = message
+					replied.set()
+		except trio_websocket.ConnectionClosed:
+			pass
+
+
+class Tab:
+	def __init__(self, devtools: AsyncDevTools, context_id: str, target_id: str, session_id: str) -> None:
+		self.devtools = devtools
+		self.context_id = context_id
+		self.target_id = target_id
+		self.session_id = session_id
+
+	async def send(self, method: str, params: dict | None = None, timeout: float = COMMAND_TIMEOUT_SECONDS) -> dict:
+		return await self.devtools.send(method, params, self.session_id, timeout)
+
+	def listen(self, method: str) -> trio.MemoryReceiveChannel:
+		return self.devtools.listen(method, self.session_id)
+
+	async def evaluate(self, expression: str, timeout: float = COMMAND_TIMEOUT_SECONDS) -> Any:  # noqa: ANN401
+		result = await self.send(
+			'Runtime.evaluate', {'expression': expression, 'awaitPromise': True, 'returnByValue': True}, timeout
+		)
+		if 'exceptionDetails' in result:
+			details = result['exceptionDetails']
+			raise JavascriptException(details.get('exception', {}).get('description') or details.get('text'))
+
+		return result['result'].get('value')
+
+	async def goto(self, url: str, timeout: int) -> None:
+		"""Navigate and return once the new document is parsed, like the eager page-load strategy."""
+		await self.send('Page.navigate', {'url': url})
+
+		with trio.fail_after(timeout):
+			while True:
+				try:
+					if await self.evaluate(_DOCUMENT_PARSED):
+						return
+				except (JavascriptException, WebDriverException):
+					# The old document's execution context goes away mid-navigation.
+					pass
+				await trio.sleep(0.025)
+
+	async def wait_for(self, predicate: str, timeout: int) -> Any:  # noqa: ANN401
+		"""Resolve with the first truthy value of an in-page predicate (same predicates as tests/selectors.py)."""
+		expression = _EVALUATE_WAIT.format(
+			function=WAIT_FOR_FUNCTION.strip(), predicate=predicate.strip(), timeout_ms=timeout * 1000
+		)
+		# The in-page wait gives up after `timeout`; the extra round trip covers a page that stops answering.
+		value = await self.evaluate(expression, timeout + COMMAND_TIMEOUT_SECONDS)
+		if not value:
+			raise TimeoutException(f"Condition not met after {timeout}s")
+
+		return value
+
+	async def fill(self, xpath: str, text: str) -> None:
+		if not await self.evaluate(_FILL_SCRIPT.format(element=_ELEMENT.format(xpath=json.dumps(xpath)))):
+			raise WebDriverException(f"No input found for {xpath}")
+		await self.send('Input.insertText', {'text': text})
+
+	async def click(self, xpath: str) -> None:
+		if not await self.evaluate(_CLICK_SCRIPT.format(element=_ELEMENT.format(xpath=json.dumps(xpath)))):
+			raise WebDriverException(f"No element found for {xpath}")
+
+
+class AsyncBrowser:
+	def __init__(self, devtools: AsyncDevTools) -> None:
+		self.devtools = devtools
+
+	async def new_tab(self, geolocation: int | None = None) -> Tab:
+		context_id = (await self.devtools.send(
+			'Target.createBrowserContext', {'disposeOnDetach': True}
+		))['browserContextId']
+
+		if geolocation in PERMISSION_SETTINGS:
+			await self.devtools.send('Browser.setPermission', {
+				'permission': {'name': 'geolocation'},
+				'setting': PERMISSION_SETTINGS[geolocation],
+				'browserContextId': context_id,
+			})
+
+		return await self.open_in(context_id)
+
+	async def open_in(self, context_id: str) -> Tab:
+		"""Another tab in an existing browser context, sharing its cache and storage; closed with the context."""
+		target_id = (await self.devtools.send(
+			'Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id}
+		))['targetId']
+		session_id = (await self.devtools.send(
+			'Target.attachToTarget', {'targetId': target_id, 'flatten': True}
+		))['sessionId']
+
+		return Tab(self.devtools, context_id, target_id, session_id)
+
+	async def close_tab(self, tab: Tab) -> None:
+		await self.devtools.send('Target.disposeBrowserContext', {'browserContextId': tab.context_id})
+
+	@asynccontextmanager
+	async def tab(self, geolocation: int | None = None) -> AsyncIterator[Tab]:
+		tab = await self.new_tab(geolocation)
+		try:
+			yield tab
+		finally:
+			with trio.CancelScope(shield=True):
+				await self.close_tab(tab)
+
+
+@asynccontextmanager
+async def connect(websocket_url: str) -> AsyncIterator[AsyncBrowser]:
+	async with trio_websocket.open_websocket_url(websocket_url, max_message_size=64 * 1024 * 1024) as ws:
+		async with trio.open_nursery() as nursery:
+			devtools = AsyncDevTools(ws)
+			nursery.start_soon(devtools.read_replies)
+			try:
+				yield AsyncBrowser(devtools)
+			finally:
+				nursery.cancel_scope.cancel()
@@ -0,0 +1,53 @@
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+GEOLOCATION_ALLOW = 1
+GEOLOCATION_BLOCK = 2
+
+
+def chrome_options(geolocation: int | None = None, headless: bool = False) -> ChromeOptions:
+	options = ChromeOptions()
+
+	if geolocation is not None:
+		prefs = {
+			'profile.default_content_setting_values.geolocation': geolocation
+		}
+		options.add_experimental_option('prefs', prefs)
+
+	if headless:
+		options.add_argument('--headless=new')
+
+	return options
+
+
+class ChromeSession(ChromiumDriver):
+	"""Chrome driver that talks to an already running chromedriver instead of starting its own.
+
+	Passing `session_id` and `capabilities` attaches to a session another process created; otherwise a new
+	session is started. `quit()` ends only the session, the chromedriver process is left to its owner.
+	"""
+
+	def __init__(
+			self,
+			executor_url: str,
+			options: ChromeOptions | None = None,
+			session_id: str | None = None,
+			capabilities: dict | None = None,
+	) -> None:
+		self._attach_to = (session_id, capabilities) if session_id else None
+		executor = ChromiumRemoteConnection(
+			remote_server_addr=executor_url, vendor_prefix='goog', browser_name='chrome'
+		)
+		RemoteWebDriver.__init__(self, command_executor=executor, options=options or ChromeOptions())
+
+	def start_session(self, capabilities: dict) -> None:
+		if self._attach_to is None:
+			super().start_session(capabilities)
+			return
+
+		self.session_id, self.caps = self._attach_to
+
+	def quit(self) -> None:
+		RemoteWebDriver.quit(self)
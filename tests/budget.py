@@ -0,0 +1,304 @@
+"""Transfer budget of the frontend's first load.
+
+The page at `URL` is loaded in a fresh browser context (an empty cache, like every fixture) and every response
+is read from DevTools Network events: resource type, host, bytes over the wire, uncompressed size and the
+compression and caching headers. `tests/asset_budget.json` sets limits on the transferred bytes, the request
+count and the uncompressed bytes, for the whole load, per resource type and per host (`*` applies to every host
+not listed on its own), and lists the resource types that must be compressed or carry cache headers.
+
+The file is not shipped with guessed numbers: run this module against the deployed build to measure the first load
+of `URL` a few times and write the largest figures, plus headroom, as the limits. The compression and cache-header
+lists of an existing file are kept, `DEFAULT_POLICY` is used for a new one:
+
+    python -m tests.budget --runs 3 --headroom 0.2
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import trio
+from dotenv import load_dotenv
+
+from tests import async_driver
+from tests.selectors import APP_READY_PREDICATE
+
+load_dotenv()
+url = os.getenv("URL")
+
+BUDGET_FILE = Path(__file__).parent / 'asset_budget.json'
+
+CACHE_KEY = 'weather_e2e/asset_budget'
+
+METRICS = ('transfer_bytes', 'requests', 'decoded_bytes')
+
+# Rules of the budget file that are policy rather than measurements; a generated budget keeps them.
+POLICY_KEYS = ('require_compression', 'compression_min_bytes', 'require_cache_headers')
+
+# Fonts and images already use compressed formats; the document and API responses depend on the server.
+DEFAULT_POLICY = {
+	'require_compression': ['script', 'stylesheet'],
+	'compression_min_bytes': 1024,
+	'require_cache_headers': ['script', 'stylesheet', 'font', 'image'],
+}
+
+_CACHE_HEADERS = ('cache-control', 'etag', 'last-modified', 'expires')
+
+# Content hashes in bundle names (main.3f2a9c1e.js, index-BkT0rCz1.css) change with every build.
+_CONTENT_HASH = re.compile(r'[.-][0-9A-Za-z_]{8,}(?=\.\w+$)')
+
+
+@dataclass(frozen=True, slots=True)
+class Resource:
+	url: str
+	type: str
+	status: int
+	transfer_bytes: int
+	decoded_bytes: int
+	encoding: str | None
+	cache_headers: tuple[str, ...]
+
+	@property
+	def host(self) -> str:
+		return urlparse(self.url).netloc
+
+	@property
+	def key(self) -> str:
+		"""Name of the resource that stays the same across builds."""
+		parsed = urlparse(self.url)
+		return parsed.netloc + _CONTENT_HASH.sub('', parsed.path)
+
+
+def load(path: str | Path | None = None) -> dict:
+	with open(path or BUDGET_FILE) as file:
+		return json.load(file)
+
+
+async def load_page_resources(websocket_url: str, url: str, timeout: int, settle: float = 0.5) -> list[Resource]:
+	async with async_driver.connect(websocket_url) as browser, browser.tab() as tab:
+		responses = tab.listen('Network.responseReceived')
+		received = tab.listen('Network.dataReceived')
+		finished = tab.listen('Network.loadingFinished')
+		await tab.send('Network.enable')
+
+		await tab.goto(url, timeout)
+		await tab.wait_for(APP_READY_PREDICATE, timeout)
+		# Requests that start with the render (icons, fonts) finish just after the app reports ready.
+		await trio.sleep(settle)
+
+		def drain(channel: trio.MemoryReceiveChannel) -> list[dict]:
+			events = []
+			while True:
+				try:
+					events.append(channel.receive_nowait())
+				except trio.WouldBlock:
+					return events
+
+		decoded: dict[str, int] = {}
+		for event in drain(received):
+			decoded[event['requestId']] = decoded.get(event['requestId'], 0) + event['dataLength']
+		transferred = {event['requestId']: event['encodedDataLength'] for event in drain(finished)}
+
+		resources = []
+		for event in drain(responses):
+			response = event['response']
+			if response['url'].startswith('data:') or event['requestId'] not in transferred:
+				continue
+
+			headers = {name.lower(): value for name, value in response.get('headers', {}).items()}
+			encoding = headers.get('content-encoding')
+			resources.append(Resource(
+				url=response['url'],
+				type=event.get('type', 'Other').lower(),
+				status=response['status'],
+				transfer_bytes=int(transferred[event['requestId']]),
+				decoded_bytes=decoded.get(event['requestId'], 0),
+				encoding=encoding if encoding and encoding != 'identity' else None,
+				cache_headers=tuple(name for name in _CACHE_HEADERS if name in headers),
+			))
+
+		return resources
+
+
+def totals(resources: list[Resource]) -> dict[str, int]:
+	return {
+		'transfer_bytes': sum(resource.transfer_bytes for resource in resources),
+		'requests': len(resources),
+		'decoded_bytes': sum(resource.decoded_bytes for resource in resources),
+	}
+
+
+def _over_limits(scope: str, resources: list[Resource], limits: dict) -> list[str]:
+	measured = totals(resources)
+	return [
+		f"{scope}: {metric} {measured[metric]:,} over the budget of {limits[metric]:,}"
+		for metric in METRICS
+		if metric in limits and measured[metric] > limits[metric]
+	]
+
+
+def _grouped(resources: list[Resource], group: Callable[[Resource], str]) -> dict[str, list[Resource]]:
+	groups: dict[str, list[Resource]] = {}
+	for resource in resources:
+		groups.setdefault(group(resource), []).append(resource)
+	return groups
+
+
+def check(resources: list[Resource], budget: dict) -> list[str]:
+	violations = _over_limits('total', resources, budget.get('total', {}))
+
+	by_type = _grouped(resources, lambda resource: resource.type)
+	for resource_type, limits in budget.get('types', {}).items():
+		violations += _over_limits(f"type {resource_type}", by_type.get(resource_type, []), limits)
+
+	host_limits = budget.get('hosts', {})
+	for host, members in _grouped(resources, lambda resource: resource.host).items():
+		limits = host_limits.get(host, host_limits.get('*'))
+		if limits:
+			violations += _over_limits(f"host {host}", members, limits)
+
+	compressed_types = budget.get('require_compression', [])
+	minimum = budget.get('compression_min_bytes', 1024)
+	violations += [
+		f"{resource.url}: {resource.decoded_bytes:,} bytes of {resource.type} sent uncompressed"
+		for resource in resources
+		if resource.type in compressed_types and resource.decoded_bytes >= minimum and resource.encoding is None
+	]
+
+	cached_types = budget.get('require_cache_headers', [])
+	violations += [
+		f"{resource.url}: {resource.type} without Cache-Control, ETag, Last-Modified or Expires"
+		for resource in resources
+		if resource.type in cached_types and not resource.cache_headers
+	]
+
+	return violations
+
+
+def breakdown(resources: list[Resource]) -> str:
+	lines = [f"{'transfer':>10} {'decoded':>10}  {'type':<11} {'encoding':<8} {'cache':<5} url"]
+	for resource in sorted(resources, key=lambda resource: resource.transfer_bytes, reverse=True):
+		lines.append(
+			f"{resource.transfer_bytes:>10,} {resource.decoded_bytes:>10,}  {resource.type:<11} "
+			f"{resource.encoding or '-':<8} {'yes' if resource.cache_headers else 'no':<5} {resource.url}"
+		)
+	return '\n'.join(lines)
+
+
+def _restore(entry: dict) -> Resource:
+	return Resource(**{**entry, 'cache_headers': tuple(entry['cache_headers'])})
+
+
+def _sizes(resources: list[Resource]) -> dict[str, int]:
+	sizes: dict[str, int] = {}
+	for resource in resources:
+		sizes[resource.key] = sizes.get(resource.key, 0) + resource.transfer_bytes
+	return sizes
+
+
+def diff(resources: list[Resource], previous: list[dict]) -> str:
+	"""Resources added, removed or changed in size since `previous` (the last passing load)."""
+	previous_resources = [_restore(entry) for entry in previous]
+	before, now = _sizes(previous_resources), _sizes(resources)
+
+	lines = []
+	for key in sorted(set(before) | set(now)):
+		if key not in before:
+			lines.append(f"+ {key}: {now[key]:,} bytes")
+		elif key not in now:
+			lines.append(f"- {key}: {before[key]:,} bytes")
+		elif now[key] != before[key]:
+			lines.append(f"~ {key}: {before[key]:,} -> {now[key]:,} ({now[key] - before[key]:+,})")
+
+	old_totals, new_totals = totals(previous_resources), totals(resources)
+	lines.append('total: ' + ', '.join(
+		f"{metric} {old_totals[metric]:,} -> {new_totals[metric]:,}" for metric in METRICS
+	))
+	return '\n'.join(lines)
+
+
+def report(violations: list[str], resources: list[Resource], previous: dict | None) -> str:
+	sections = ['Asset budget exceeded:\n' + '\n'.join(violations), 'Resources:\n' + breakdown(resources)]
+	if previous:
+		changes = diff(resources, previous['resources'])
+		sections.append(f"Changes since the last passing load of {previous['url']}:\n{changes}")
+	else:
+		sections.append('No passing load recorded yet to compare with.')
+	return '\n\n'.join(sections)
+
+
+def remember(resources: list[Resource], url: str) -> dict:
+	"""Cache entry of a passing load, for the diff of the next failure."""
+	return {'url': url, 'resources': [asdict(resource) for resource in resources]}
+
+
+def _limit(metric: str, value: int, headroom: float) -> int:
+	limit = value * (1 + headroom)
+	# Byte limits are rounded up to whole kilobytes so that a regenerated file only changes when sizes do.
+	return math.ceil(limit / 1000) * 1000 if metric.endswith('_bytes') else math.ceil(limit)
+
+
+def generate(loads: list[list[Resource]], policy: dict, headroom: float) -> dict:
+	"""Budget with the largest figures of `loads` plus `headroom` (0.2 is 20 %) as its limits."""
+
+	def limits(groups: list[list[Resource]]) -> dict[str, int]:
+		largest = {metric: max(totals(group)[metric] for group in groups) for metric in METRICS}
+		return {metric: _limit(metric, value, headroom) for metric, value in largest.items()}
+
+	types = sorted({resource.type for resources in loads for resource in resources})
+	per_host = [
+		members for resources in loads for members in _grouped(resources, lambda resource: resource.host).values()
+	]
+	return {
+		'total': limits(loads),
+		'types': {
+			resource_type: limits([
+				[resource for resource in resources if resource.type == resource_type] for resources in loads
+			])
+			for resource_type in types
+		},
+		'hosts': {'*': {'requests': limits(per_host)['requests']}},
+		**{key: policy[key] for key in POLICY_KEYS if key in policy},
+	}
+
+
+def main() -> None:
+	from tests import launch
+	from tests.devtools import browser_websocket_url
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=3, help='First loads to measure (the largest figures are kept).')
+	parser.add_argument('--headroom', type=float, default=0.2, help='Fraction added on top of the measured figures.')
+	parser.add_argument('--timeout', type=int, default=15)
+	parser.add_argument('--output', default=str(BUDGET_FILE), help='Budget file to write (its policy lists are kept).')
+	parser.add_argument('--headed', action='store_true', help='Launch a visible browser window.')
+	args = parser.parse_args()
+
+	policy = load(args.output) if os.path.exists(args.output) else DEFAULT_POLICY
+
+	driver = launch.new_session(headless=not args.headed)
+	try:
+		websocket_url = browser_websocket_url(driver)
+		loads = [trio.run(load_page_resources, websocket_url, url, args.timeout) for _ in range(args.runs)]
+	finally:
+		driver.quit()
+		launch.shutdown()
+
+	if not all(loads):
+		raise SystemExit(f"No responses recorded while loading {url}")
+
+	print(breakdown(loads[-1]))
+	with open(args.output, 'w') as file:
+		json.dump(generate(loads, policy, args.headroom), file, indent='\t')
+		file.write('\n')
+	print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+	main()
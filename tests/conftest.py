@@ -1,51 +1,312 @@
 import os
+from contextlib import contextmanager
+from typing import Iterator
 
 import pytest
+from _pytest.config import Config
+from _pytest.config.argparsing import Parser
+from _pytest.fixtures import FixtureRequest
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from tests import artifacts, console, contexts, launch, resources, throttling, tracing, validation
+from tests.browser import GEOLOCATION_ALLOW, GEOLOCATION_BLOCK
+from tests.devtools import browser_websocket_url
+from tests.pages import WeatherPage
+from tests.result_cache import ResultCache
+from tests.selectors import wait_for_app_ready
+from tests.smoke import FEATURE_AREAS, TimeBudget
+from tests.snapshot import PageSnapshot, capture_snapshot
+
 load_dotenv()
 url = os.getenv("URL")
 
+# A pass without CPU throttling, without failing on page exceptions or against another budget file says nothing
+# about a run with them, and a pass against other visual baselines says nothing about the current ones.
+RESULT_CACHE_OPTIONS = ('--cpu-slowdown', '--fail-on-js-error', '--asset-budget')
+RESULT_CACHE_SUPPORT = ('visual_baselines/*',)
+
+
+def pytest_addoption(parser: Parser) -> None:
+	parser.addoption(
+		'--trace-file',
+		default=None,
+		help='Write a Chrome trace-event timeline of the run to this path (open it in Perfetto or chrome://tracing).'
+	)
+	parser.addoption(
+		'--no-daemon',
+		action='store_true',
+		help='Always launch Chrome locally, even when the warm-browser daemon (python -m tests.daemon) is running.'
+	)
+	parser.addoption(
+		'--result-cache-window',
+		type=float,
+		default=None,
+		help='Skip tests that passed against the same frontend build and test code within this many hours '
+		'(off by default).'
+	)
+	parser.addoption(
+		'--force-full-run',
+		action='store_true',
+		help='Run every test but still record the results for later --result-cache-window runs.'
+	)
+	parser.addoption(
+		'--time-budget',
+		type=float,
+		default=None,
+		help='Run only a smoke subset estimated to fit in this many seconds, still covering every feature area.'
+	)
+	parser.addoption(
+		'--record-snapshots',
+		default=None,
+		help='Append every page snapshot the snapshot fixtures capture to this NDJSON file (see tests/validation.py).'
+	)
+	parser.addoption(
+		'--resource-report',
+		action='store_true',
+		help='Sample CPU time, memory and process count of Chrome and chromedriver during every test (Linux /proc).'
+	)
+	parser.addoption(
+		'--ram-limit',
+		type=float,
+		default=None,
+		help='RAM in MB to size the worker count against in the resource report (default: MemAvailable).'
+	)
+	parser.addoption(
+		'--asset-budget',
+		default=None,
+		help="Budget file for the frontend's first load (default: tests/asset_budget.json, see tests/budget.py)."
+	)
+	parser.addoption(
+		'--failure-artifacts',
+		default='artifacts',
+		help='Directory for the screenshot, DOM, console and network log of failed tests (empty to turn off).'
+	)
+	parser.addoption(
+		'--fail-on-js-error',
+		action='store_true',
+		help='Fail tests whose page throws an uncaught JavaScript exception (see tests/console.py).'
+	)
+	parser.addoption(
+		'--cpu-slowdown',
+		type=float,
+		default=None,
+		help='Throttle the CPU of every fixture page this many times (DevTools emulation), scale the timeouts '
+		'accordingly and report page load and Update location timings (see tests/throttling.py).'
+	)
+	parser.addoption(
+		'--update-visual-baselines',
+		action='store_true',
+		help='Write the region screenshots of the visual check to tests/visual_baselines/ instead of comparing them.'
+	)
+	parser.addoption(
+		'--concurrent',
+		action='store_true',
+		help='Run scenarios that have a concurrent variant as one test driving many tabs at once '
+		'(tests/async_driver.py) instead of one WebDriver test each.'
+	)
+	parser.addoption(
+		'--headed',
+		action='store_true',
+		help='Show the browser windows of locally launched Chrome instead of running it headless.'
+	)
+
+
+def pytest_configure(config: Config) -> None:
+	config.addinivalue_line(
+		'markers', f"feature(*areas): feature areas the test covers, one of {', '.join(FEATURE_AREAS)}"
+	)
+
+	config.addinivalue_line(
+		'markers', 'js_errors(fail=True): fail (or with fail=False, do not fail) the test on uncaught page exceptions'
+	)
+	config.addinivalue_line(
+		'markers', "variant(name): 'sequential' or 'concurrent' implementation of the same scenarios; --concurrent "
+		"runs the concurrent one, the sequential one runs otherwise"
+	)
+
+	# Both plugins keep their state in pytest's cache, which `-p no:cacheprovider` takes away.
+	has_cache = hasattr(config, 'cache')
+	result_cache_window = config.getoption('--result-cache-window')
+	if has_cache and (result_cache_window or config.getoption('--force-full-run')):
+		config.pluginmanager.register(
+			ResultCache(
+				config,
+				url,
+				result_cache_window or 0,
+				config.getoption('--force-full-run'),
+				record=not os.getenv('PYTEST_XDIST_WORKER'),
+				run_options=RESULT_CACHE_OPTIONS,
+				support_globs=RESULT_CACHE_SUPPORT,
+			),
+			'weather_e2e_result_cache',
+		)
+	if has_cache:
+		config.pluginmanager.register(
+			TimeBudget(config, config.getoption('--time-budget'), record=not os.getenv('PYTEST_XDIST_WORKER')),
+			'weather_e2e_time_budget',
+		)
+
+	config.pluginmanager.register(
+		console.ConsoleCapture(config.getoption('--fail-on-js-error')), 'weather_e2e_console'
+	)
+
+	cpu_slowdown = config.getoption('--cpu-slowdown')
+	if cpu_slowdown:
+		config.pluginmanager.register(throttling.CpuTimings(cpu_slowdown), 'weather_e2e_cpu_timings')
+
+	if config.getoption('--resource-report') and resources.available():
+		config.pluginmanager.register(
+			resources.ResourceMonitor(config.getoption('--ram-limit')), 'weather_e2e_resources'
+		)
+
+	artifacts_dir = config.getoption('--failure-artifacts')
+	if artifacts_dir:
+		config.pluginmanager.register(
+			artifacts.FailureArtifacts(os.path.abspath(artifacts_dir)), 'weather_e2e_failure_artifacts'
+		)
+
+	trace_file = config.getoption('--trace-file')
+	if trace_file:
+		tracing.start(os.path.abspath(trace_file), os.getenv('PYTEST_XDIST_WORKER'))
+		tracing.instrument_selenium()
+
+
+def pytest_unconfigure(config: Config) -> None:
+	contexts.shutdown()
+	launch.shutdown()
+
+	trace_file = config.getoption('--trace-file')
+	if not trace_file:
+		return
+
+	tracing.stop()
+	if not os.getenv('PYTEST_XDIST_WORKER'):
+		tracing.merge_parts(os.path.abspath(trace_file))
+
+
+def pytest_collection_modifyitems(config: Config, items: list[pytest.Item]) -> None:
+	wanted = 'concurrent' if config.getoption('--concurrent') else 'sequential'
+	other_variant = [
+		item for item in items
+		if (marker := item.get_closest_marker('variant')) is not None and marker.args[0] != wanted
+	]
+	if other_variant:
+		config.hook.pytest_deselected(items=other_variant)
+		items[:] = [item for item in items if item not in other_variant]
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item) -> object:
+	with tracing.span(item.nodeid, 'test'):
+		return (yield)
+
+
+def _context_host(request: FixtureRequest) -> contexts.ContextHost:
+	return contexts.host(
+		headless=not request.config.getoption('--headed'), use_daemon=not request.config.getoption('--no-daemon')
+	)
+
+
+@contextmanager
+def _isolated_driver(request: FixtureRequest, timeout: int, geolocation: int | None = None) -> Iterator[WebDriver]:
+	track = tracing.new_browser_track(request.node.nodeid or request.fixturename)
+
+	with tracing.span('contexts.host()', 'fixture', track):
+		host = _context_host(request)
+
+	driver = host.driver
+	cpu_slowdown = request.config.getoption('--cpu-slowdown')
+	context_id = None
+	listener = None
+	try:
+		with tracing.span('contexts.open()', 'fixture', track):
+			context_id = host.open(geolocation)
+		tracing.bind_driver(driver, track)
+
+		if request.config.getoption('--failure-artifacts'):
+			artifacts.install(driver)
+		if cpu_slowdown:
+			throttling.apply(driver, cpu_slowdown, timeout)
+		if request.scope == 'function':
+			request.node.stash[artifacts.DRIVER_KEY] = driver
+			# A listener costs a websocket and a thread per test, so only tests that fail on page exceptions get one.
+			if console.fails_on_errors(request.node, request.config.getoption('--fail-on-js-error')):
+				listener = console.ConsoleListener(host.websocket_url, host.target_id)
+				request.node.stash[console.LISTENER_KEY] = listener
+
+		with tracing.span('driver.get(url)', 'fixture', track, {'url': url}):
+			driver.get(url)
+		wait_for_app_ready(driver, timeout)
+		tracing.record_page_timeline(driver)
+
+		yield driver
+	finally:
+		if listener is not None:
+			listener.stop()
+		if context_id is not None:
+			if cpu_slowdown and request.scope == 'function':
+				request.node.user_properties.append(('timings', throttling.read(driver)))
+			with tracing.span('contexts.close()', 'fixture', track):
+				host.close(context_id)
+
 
 @pytest.fixture()
-def driver() -> WebDriver:
-	driver = webdriver.Chrome()
-	driver.get(url)
-	yield driver
-	driver.quit()
+def driver(request: FixtureRequest, timeout_value: int) -> WebDriver:
+	with _isolated_driver(request, timeout_value) as driver:
+		yield driver
 
 
 @pytest.fixture()
-def driver_with_location_permission() -> WebDriver:
-	options = ChromeOptions()
-	prefs = {
-		'profile.default_content_setting_values.geolocation': 1
-	}
+def driver_with_location_permission(request: FixtureRequest, timeout_value: int) -> WebDriver:
+	with _isolated_driver(request, timeout_value, GEOLOCATION_ALLOW) as driver:
+		yield driver
 
-	options.add_experimental_option('prefs', prefs)
-	driver = webdriver.Chrome(options=options)
-	driver.get(url)
-	yield driver
-	driver.quit()
+
+@pytest.fixture()
+def driver_without_location_permission(request: FixtureRequest, timeout_value: int) -> WebDriver:
+	with _isolated_driver(request, timeout_value, GEOLOCATION_BLOCK) as driver:
+		yield driver
 
 
 @pytest.fixture()
-def driver_without_location_permission() -> WebDriver:
-	options = ChromeOptions()
-	prefs = {
-		'profile.default_content_setting_values.geolocation': 2
-	}
+def weather_page(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> WeatherPage:
+	page = WeatherPage(request.getfixturevalue(driver_fixture), timeout_value)
+	yield page
+	request.node.user_properties.append(('page_cache', page.stats()))
+
 
-	options.add_experimental_option('prefs', prefs)
-	driver = webdriver.Chrome(options=options)
-	driver.get(url)
-	yield driver
-	driver.quit()
+def _snapshot(request: FixtureRequest, timeout: int, geolocation: int) -> PageSnapshot:
+	with _isolated_driver(request, timeout, geolocation) as driver:
+		snapshot = capture_snapshot(driver)
+
+	record_path = request.config.getoption('--record-snapshots')
+	if record_path:
+		validation.record(os.path.abspath(record_path), snapshot, geolocation, url)
+
+	return snapshot
+
+
+@pytest.fixture(scope='session')
+def snapshot_with_location_permission(request: FixtureRequest, timeout_value: int) -> PageSnapshot:
+	return _snapshot(request, timeout_value, GEOLOCATION_ALLOW)
+
+
+@pytest.fixture(scope='session')
+def snapshot_without_location_permission(request: FixtureRequest, timeout_value: int) -> PageSnapshot:
+	return _snapshot(request, timeout_value, GEOLOCATION_BLOCK)
+
+
+@pytest.fixture(scope='session')
+def app_url() -> str:
+	return url
 
 
 @pytest.fixture()
-def timeout_value() -> int:
-	return 15
+def devtools_url(request: FixtureRequest) -> str:
+	return browser_websocket_url(_context_host(request).driver)
+
+
+@pytest.fixture(scope='session')
+def timeout_value(request: FixtureRequest) -> int:
+	return throttling.scaled_timeout(15, request.config.getoption('--cpu-slowdown'))
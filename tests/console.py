@@ -0,0 +1,201 @@
+"""Console messages and uncaught exceptions of the page under test, streamed as they happen.
+
+For every test that gets a driver and fails on page exceptions (see below), a listener thread attaches to the test's
+page over the DevTools websocket before the page loads and subscribes to `Runtime.consoleAPICalled`,
+`Runtime.exceptionThrown` and `Log.entryAdded` (browser-side messages such as failed requests). Events land in a
+per-test buffer with no polling and no extra WebDriver round trips. When the test finishes, every entry is
+attributed to the test step (the `tests/tracing.py` spans: fixture setup, selectors, page object actions) that was
+running at its timestamp.
+
+With `--fail-on-js-error`, or `@pytest.mark.js_errors(fail=True)` on a test, an uncaught exception fails the test
+even if its assertions passed; `@pytest.mark.js_errors(fail=False)` opts a test out.
+"""
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+
+import pytest
+import websocket
+from _pytest.reports import TestReport
+from _pytest.runner import CallInfo
+
+from tests import tracing
+from tests.artifacts import RECORDER_SOURCE_URL
+
+LISTENER_KEY = pytest.StashKey['ConsoleListener']()
+
+_EVENTS = ('Runtime.consoleAPICalled', 'Runtime.exceptionThrown', 'Log.entryAdded')
+
+
+@dataclass(frozen=True, slots=True)
+class ConsoleEntry:
+	kind: str
+	level: str
+	text: str
+	url: str | None
+	timestamp_us: float
+	step: str | None = None
+
+
+def _argument(value: dict) -> str:
+	if 'value' in value:
+		return value['value'] if isinstance(value['value'], str) else json.dumps(value['value'])
+	return value.get('description') or value.get('unserializableValue') or value.get('type', '')
+
+
+def to_entry(method: str, params: dict) -> ConsoleEntry:
+	# DevTools timestamps are milliseconds since the epoch; spans use microseconds on the same clock.
+	if method == 'Runtime.consoleAPICalled':
+		# With failure artifacts on, the recorder's console wrapper is the top frame; the caller is the one below it.
+		frames = [
+			frame for frame in params.get('stackTrace', {}).get('callFrames', [])
+			if frame.get('url') != RECORDER_SOURCE_URL
+		]
+		return ConsoleEntry(
+			'console',
+			params['type'],
+			' '.join(_argument(argument) for argument in params.get('args', [])),
+			frames[0]['url'] if frames else None,
+			params['timestamp'] * 1000,
+		)
+
+	if method == 'Runtime.exceptionThrown':
+		details = params['exceptionDetails']
+		description = details.get('exception', {}).get('description')
+		return ConsoleEntry(
+			'exception',
+			'error',
+			description or details.get('text', ''),
+			details.get('url'),
+			params['timestamp'] * 1000,
+		)
+
+	entry = params['entry']
+	return ConsoleEntry('log', entry['level'], entry['text'], entry.get('url'), entry['timestamp'] * 1000)
+
+
+class ConsoleListener(threading.Thread):
+	"""Attached to one page target; buffers its console events until `stop()`."""
+
+	def __init__(self, websocket_url: str, target_id: str) -> None:
+		super().__init__(name=f'console-{target_id[:8]}', daemon=True)
+		self.entries: list[ConsoleEntry] = []
+		self._ws = websocket.create_connection(websocket_url, suppress_origin=True)
+		self._message_id = 0
+		self._session_id: str | None = None
+		try:
+			self._session_id = self._command(
+				'Target.attachToTarget', {'targetId': target_id, 'flatten': True}
+			)['sessionId']
+			self._command('Runtime.enable')
+			self._command('Log.enable')
+		except BaseException:
+			self._ws.close()
+			raise
+		self.start()
+
+	def _command(self, method: str, params: dict | None = None) -> dict:
+		self._message_id += 1
+		message = {'id': self._message_id, 'method': method, 'params': params or {}}
+		if self._session_id:
+			message['sessionId'] = self._session_id
+		self._ws.send(json.dumps(message))
+
+		while True:
+			reply = json.loads(self._ws.recv())
+			if reply.get('id') == self._message_id:
+				return reply.get('result', {})
+			self._handle(reply)
+
+	def _handle(self, message: dict) -> None:
+		if message.get('method') in _EVENTS and message.get('sessionId') == self._session_id:
+			self.entries.append(to_entry(message['method'], message['params']))
+
+	def run(self) -> None:
+		try:
+			while True:
+				self._handle(json.loads(self._ws.recv()))
+		except (websocket.WebSocketException, OSError):
+			pass
+
+	def stop(self) -> list[ConsoleEntry]:
+		self._ws.close()
+		self.join(timeout=5)
+		return list(self.entries)
+
+
+def step_at(steps: list[list], timestamp_us: float) -> str | None:
+	"""The open spans at `timestamp_us`, outermost first, and the last one that finished before it."""
+	running = [step for step in steps if step[2] <= timestamp_us and (step[3] is None or timestamp_us <= step[3])]
+	finished = [step for step in steps if step[3] is not None and step[3] < timestamp_us]
+
+	def name(step: list) -> str:
+		return 'test body' if step[1] == 'test' else step[0]
+
+	parts = []
+	if running:
+		parts.append('during ' + ' > '.join(name(step) for step in running))
+	if finished:
+		parts.append('after ' + name(max(finished, key=lambda step: step[3])))
+	return ', '.join(parts) or None
+
+
+def fails_on_errors(item: pytest.Item, default: bool) -> bool:
+	"""Whether an uncaught page exception fails `item`; only such tests get a listener."""
+	marker = item.get_closest_marker('js_errors')
+	return marker.kwargs.get('fail', True) if marker else default
+
+
+class ConsoleCapture:
+	"""pytest plugin: keeps the step log of each test and reports what its page logged."""
+
+	def __init__(self, fail_on_error: bool) -> None:
+		self.fail_on_error = fail_on_error
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_setup(self, item: pytest.Item) -> object:
+		tracing.start_steps()
+		return (yield)
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_makereport(self, item: pytest.Item, call: CallInfo) -> TestReport:
+		report = yield
+		listener = item.stash.get(LISTENER_KEY, None)
+		if call.when != 'call' or listener is None:
+			return report
+
+		steps = tracing.steps()
+		entries = [
+			ConsoleEntry(**{**asdict(entry), 'step': step_at(steps, entry.timestamp_us)})
+			for entry in list(listener.entries)
+		]
+		if not entries:
+			return report
+
+		report.user_properties.append(('console', {
+			'exceptions': sum(entry.kind == 'exception' for entry in entries),
+			'errors': sum(entry.level == 'error' for entry in entries),
+			'warnings': sum(entry.level in ('warning', 'warn') for entry in entries),
+			'messages': len(entries),
+		}))
+		report.sections.append(('browser console', '\n'.join(
+			f"[{entry.kind} {entry.level}] {entry.text}" + (f"  ({entry.step})" if entry.step else '')
+			for entry in entries
+		)))
+
+		exceptions = [entry for entry in entries if entry.kind == 'exception']
+		if exceptions and report.passed and fails_on_errors(item, self.fail_on_error):
+			report.outcome = 'failed'
+			report.longrepr = 'Uncaught JavaScript error(s) in the page:\n' + '\n'.join(
+				f"- {(entry.text.splitlines() or [''])[0]} ({entry.step or 'outside any step'})" for entry in exceptions
+			)
+
+		return report
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_teardown(self, item: pytest.Item) -> object:
+		try:
+			return (yield)
+		finally:
+			tracing.stop_steps()
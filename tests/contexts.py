@@ -0,0 +1,110 @@
+"""Per-test isolation through DevTools browser contexts inside one long-lived Chrome per worker.
+
+A browser context is Chrome's incognito-style container: its own cookies, storage, cache and permissions. Creating
+one and opening a page in it takes tens of milliseconds, against seconds for a fresh Chrome process.
+"""
+
+import time
+
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from tests import daemon, launch
+from tests.browser import GEOLOCATION_ALLOW, GEOLOCATION_BLOCK
+from tests.devtools import DevTools, browser_websocket_url
+
+PERMISSION_SETTINGS = {
+	GEOLOCATION_ALLOW: 'granted',
+	GEOLOCATION_BLOCK: 'denied',
+}
+
+
+class ContextHost:
+	def __init__(self, driver: WebDriver) -> None:
+		self.driver = driver
+		self.websocket_url = browser_websocket_url(driver)
+		self.devtools = DevTools(self.websocket_url)
+		self.target_id: str | None = None
+		self.home_handle = driver.current_window_handle
+
+	def open(self, geolocation: int | None = None) -> str:
+		"""Create a fresh browser context with one blank page and point the WebDriver session at that page."""
+		context_id = self.devtools.send('Target.createBrowserContext', {'disposeOnDetach': False})['browserContextId']
+
+		try:
+			if geolocation in PERMISSION_SETTINGS:
+				self.devtools.send('Browser.setPermission', {
+					'permission': {'name': 'geolocation'},
+					'setting': PERMISSION_SETTINGS[geolocation],
+					'browserContextId': context_id,
+				})
+
+			known_handles = set(self.driver.window_handles)
+			target_id = self.devtools.send(
+				'Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id}
+			)['targetId']
+			self.driver.switch_to.window(self._handle_for(target_id, known_handles))
+		except Exception:
+			# The caller only gets to close contexts that open() returned.
+			self.close(context_id)
+			raise
+
+		self.target_id = target_id
+		return context_id
+
+	def _handle_for(self, target_id: str, known_handles: set[str]) -> str:
+		# chromedriver names windows after their DevTools target id, but only notices a new target on its next poll.
+		deadline = time.monotonic() + 5
+		while time.monotonic() < deadline:
+			handles = self.driver.window_handles
+			if target_id in handles:
+				return target_id
+
+			new_handles = set(handles) - known_handles
+			if len(new_handles) == 1:
+				return new_handles.pop()
+			time.sleep(0.01)
+
+		raise WebDriverException(f"chromedriver did not pick up target {target_id}")
+
+	def close(self, context_id: str) -> None:
+		self.driver.switch_to.window(self.home_handle)
+		self.devtools.send('Target.disposeBrowserContext', {'browserContextId': context_id})
+
+	def quit(self) -> None:
+		self.devtools.close()
+		self.driver.quit()
+
+
+_host: ContextHost | None = None
+
+
+def host(headless: bool = True, use_daemon: bool = True) -> ContextHost:
+	"""The worker's long-lived Chrome, leased from the warm-browser daemon when it runs, launched otherwise.
+
+	The daemon only keeps headless browsers, so a headed run always launches its own.
+	"""
+	global _host
+	# The host holds its lease for the whole run, which can outlast the daemon's lease TTL. Once the lease is lost
+	# the browser may already belong to another run: drop it without touching it and launch one locally.
+	if _host is not None and isinstance(_host.driver, daemon.LeasedSession) and not _host.driver.renew():
+		_host.devtools.close()
+		_host = None
+		use_daemon = False
+
+	if _host is None:
+		driver = daemon.lease() if use_daemon and headless else None
+		_host = ContextHost(driver or launch.new_session(headless=headless))
+
+	return _host
+
+
+def current() -> ContextHost | None:
+	return _host
+
+
+def shutdown() -> None:
+	global _host
+	if _host is not None:
+		_host.quit()
+		_host = None
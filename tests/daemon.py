@@ -0,0 +1,233 @@
+"""Warm-browser daemon for fast local iteration.
+
+Keeps a pool of headless Chrome sessions alive between pytest invocations. The fixtures lease a session over a
+small HTTP API and attach to it through chromedriver's Remote WebDriver endpoint; geolocation is set per browser
+context, so any session serves any test. When the daemon is not running they launch Chrome locally as usual. A
+lease that is not renewed within `LEASE_TTL_SECONDS` is reclaimed, so a crashed run does not keep its browser
+forever; a holder whose renewal fails has lost its session and must stop using it.
+
+    python -m tests.daemon --pool-size 2
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+from selenium.common import WebDriverException
+
+from tests import launch
+from tests.browser import ChromeSession
+
+load_dotenv()
+url = os.getenv("URL")
+daemon_url = os.getenv("DAEMON_URL", "http://127.0.0.1:4445")
+
+LEASE_TTL_SECONDS = 600
+
+# A lease holder renews at most this often; any renewal well inside the TTL keeps the lease.
+RENEW_INTERVAL_SECONDS = LEASE_TTL_SECONDS / 10
+
+_RESET_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class LeasedSession(ChromeSession):
+	def __init__(self, lease: dict) -> None:
+		super().__init__(lease['executor'], session_id=lease['session_id'], capabilities=lease['capabilities'])
+		self.renewed_at = time.monotonic()
+
+	def renew(self) -> bool:
+		"""Keep the lease from expiring while the session is still in use; False once the lease is lost.
+
+		A lost lease (the daemon reclaimed it, or is gone) means the browser may already serve another run.
+		"""
+		if time.monotonic() - self.renewed_at >= RENEW_INTERVAL_SECONDS:
+			if not _posted(f'/renew/{self.session_id}'):
+				return False
+			self.renewed_at = time.monotonic()
+
+		return True
+
+	def quit(self) -> None:
+		_request(f'/release/{self.session_id}')
+
+
+class Pool:
+	def __init__(self, size: int) -> None:
+		self.size = size
+		self.lock = threading.Lock()
+		self.idle: list[ChromeSession] = []
+		self.leased: dict[str, tuple[ChromeSession, float]] = {}
+
+	def _new_session(self) -> ChromeSession:
+		driver = launch.new_session(headless=True)
+		driver.get(url)
+		return driver
+
+	def fill(self) -> None:
+		for _ in range(self.size - len(self.idle)):
+			driver = self._new_session()
+			with self.lock:
+				self.idle.append(driver)
+
+	def lease(self) -> dict | None:
+		with self.lock:
+			self._reclaim_expired()
+			if not self.idle:
+				return None
+
+			driver = self.idle.pop()
+			self.leased[driver.session_id] = (driver, time.monotonic())
+
+		return {
+			'executor': launch.shared_service().service_url,
+			'session_id': driver.session_id,
+			'capabilities': driver.caps,
+		}
+
+	def renew(self, session_id: str) -> bool:
+		with self.lock:
+			if session_id not in self.leased:
+				return False
+
+			driver, _ = self.leased[session_id]
+			self.leased[session_id] = (driver, time.monotonic())
+			return True
+
+	def release(self, session_id: str) -> None:
+		with self.lock:
+			driver, _ = self.leased.pop(session_id, (None, None))
+
+		if driver is not None:
+			threading.Thread(target=self._reset, args=(driver,), daemon=True).start()
+
+	def _reclaim_expired(self) -> None:
+		now = time.monotonic()
+		for session_id, (driver, leased_at) in list(self.leased.items()):
+			if now - leased_at > LEASE_TTL_SECONDS:
+				del self.leased[session_id]
+				threading.Thread(target=self._reset, args=(driver,), daemon=True).start()
+
+	def _reset(self, driver: ChromeSession) -> None:
+		try:
+			for handle in driver.window_handles[1:]:
+				driver.switch_to.window(handle)
+				driver.close()
+			driver.switch_to.window(driver.window_handles[0])
+			driver.delete_all_cookies()
+			driver.execute_script(_RESET_SCRIPT)
+			driver.get('about:blank')
+		except WebDriverException:
+			driver.quit()
+			driver = self._new_session()
+
+		with self.lock:
+			self.idle.append(driver)
+
+	def status(self) -> dict:
+		with self.lock:
+			return {'idle': len(self.idle), 'leased': len(self.leased)}
+
+	def close(self) -> None:
+		with self.lock:
+			drivers = self.idle + [driver for driver, _ in self.leased.values()]
+
+		for driver in drivers:
+			driver.quit()
+
+
+def _handler(pool: Pool) -> type[BaseHTTPRequestHandler]:
+	class Handler(BaseHTTPRequestHandler):
+		def _reply(self, status: HTTPStatus, body: dict | None = None) -> None:
+			payload = json.dumps(body).encode() if body is not None else b''
+			self.send_response(status)
+			self.send_header('Content-Type', 'application/json')
+			self.send_header('Content-Length', str(len(payload)))
+			self.end_headers()
+			self.wfile.write(payload)
+
+		def do_GET(self) -> None:  # noqa: N802
+			if self.path == '/status':
+				self._reply(HTTPStatus.OK, pool.status())
+			else:
+				self._reply(HTTPStatus.NOT_FOUND)
+
+		def do_POST(self) -> None:  # noqa: N802
+			_, action, argument = (self.path.split('/') + [''])[:3]
+
+			if action == 'lease':
+				lease_info = pool.lease()
+				if lease_info is None:
+					self._reply(HTTPStatus.SERVICE_UNAVAILABLE)
+				else:
+					self._reply(HTTPStatus.OK, lease_info)
+			elif action == 'renew':
+				self._reply(HTTPStatus.NO_CONTENT if pool.renew(argument) else HTTPStatus.NOT_FOUND)
+			elif action == 'release':
+				pool.release(argument)
+				self._reply(HTTPStatus.NO_CONTENT)
+			else:
+				self._reply(HTTPStatus.NOT_FOUND)
+
+		def log_message(self, format: str, *args) -> None:
+			pass
+
+	return Handler
+
+
+def _request(path: str, timeout: float = 0.5) -> dict | None:
+	request = urllib.request.Request(f'{daemon_url}{path}', method='POST' if path != '/status' else 'GET')
+	try:
+		with urllib.request.urlopen(request, timeout=timeout) as response:
+			body = response.read()
+	except (urllib.error.URLError, OSError):
+		return None
+
+	return json.loads(body) if body else None
+
+
+def _posted(path: str, timeout: float = 0.5) -> bool:
+	"""Whether the daemon accepted the request; unlike `_request`, an empty answer is not mistaken for a failure."""
+	request = urllib.request.Request(f'{daemon_url}{path}', method='POST')
+	try:
+		with urllib.request.urlopen(request, timeout=timeout):
+			return True
+	except (urllib.error.URLError, OSError):
+		return False
+
+
+def lease() -> LeasedSession | None:
+	"""Attach to a warm session from the daemon, or return None so the caller launches Chrome itself."""
+	lease_info = _request('/lease')
+	return LeasedSession(lease_info) if lease_info is not None else None
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--pool-size', type=int, default=1, help='Warm browsers kept ready.')
+	parser.add_argument('--port', type=int, default=int(daemon_url.rsplit(':', 1)[-1]))
+	args = parser.parse_args()
+
+	pool = Pool(args.pool_size)
+	server = ThreadingHTTPServer(('127.0.0.1', args.port), _handler(pool))
+
+	try:
+		pool.fill()
+		print(f'Warm-browser daemon listening on http://127.0.0.1:{args.port} ({pool.status()})')
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+		pool.close()
+		launch.shutdown()
+
+
+if __name__ == '__main__':
+	main()
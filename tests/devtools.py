@@ -0,0 +1,44 @@
+import itertools
+import json
+import urllib.request
+
+import websocket
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def browser_websocket_url(driver: WebDriver) -> str:
+	debugger_address = driver.caps['goog:chromeOptions']['debuggerAddress']
+	with urllib.request.urlopen(f'http://{debugger_address}/json/version', timeout=5) as response:
+		return json.load(response)['webSocketDebuggerUrl']
+
+
+class DevTools:
+	"""Blocking DevTools connection to the browser target, for commands chromedriver only allows on pages."""
+
+	def __init__(self, ws_url: str) -> None:
+		# Chrome rejects DevTools websockets whose Origin is not allow-listed, and a missing Origin is always allowed.
+		self._ws = websocket.create_connection(ws_url, suppress_origin=True)
+		self._ids = itertools.count(1)
+
+	@classmethod
+	def for_driver(cls, driver: WebDriver) -> 'DevTools':
+		return cls(browser_websocket_url(driver))
+
+	def send(self, method: str, params: dict | None = None, session_id: str | None = None) -> dict:
+		message_id = next(self._ids)
+		message = {'id': message_id, 'method': method, 'params': params or {}}
+		if session_id:
+			message['sessionId'] = session_id
+		self._ws.send(json.dumps(message))
+
+		while True:
+			reply = json.loads(self._ws.recv())
+			if reply.get('id') != message_id:
+				continue
+			if 'error' in reply:
+				raise WebDriverException(f"{method} failed: {reply['error'].get('message')}")
+			return reply.get('result', {})
+
+	def close(self) -> None:
+		self._ws.close()
@@ -0,0 +1,214 @@
+"""Chrome launch profile: one chromedriver per worker and Chrome started from a pre-seeded user-data-dir.
+
+Run as a module to benchmark browser startup:
+
+    python -m tests.launch --runs 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from tests.browser import ChromeSession, chrome_options
+
+# Switches that skip work Chrome does on start-up and that an E2E run never needs.
+STARTUP_SWITCHES = (
+	'--no-first-run',
+	'--no-default-browser-check',
+	'--no-service-autorun',
+	'--disable-extensions',
+	'--disable-component-extensions-with-background-pages',
+	'--disable-default-apps',
+	'--disable-background-networking',
+	'--disable-component-update',
+	'--disable-sync',
+	'--disable-client-side-phishing-detection',
+	'--disable-domain-reliability',
+	'--disable-breakpad',
+	'--disable-background-timer-throttling',
+	'--disable-backgrounding-occluded-windows',
+	'--disable-renderer-backgrounding',
+	'--disable-gpu',
+	'--disable-features=Translate,OptimizationHints,MediaRouter,DialMediaRouteProvider,AutofillServerCommunication',
+	'--metrics-recording-only',
+	'--mute-audio',
+	'--password-store=basic',
+	'--use-mock-keychain',
+)
+
+PROFILE_PREFERENCES = {
+	'browser': {'check_default_browser': False, 'has_seen_welcome_page': True},
+	'credentials_enable_service': False,
+	'profile': {'password_manager_enabled': False},
+	'translate': {'enabled': False},
+}
+
+# Chrome regenerates these on start; copying them into every profile only costs time.
+_TEMPLATE_SKIP = ('Singleton*', 'Cache', 'Code Cache', 'GPUCache', 'Crashpad', 'BrowserMetrics*')
+
+_service: ChromeService | None = None
+_template_dir: str | None = None
+
+
+class ProfiledSession(ChromeSession):
+	def __init__(self, executor_url: str, options: ChromeOptions, user_data_dir: str) -> None:
+		self.user_data_dir = user_data_dir
+		super().__init__(executor_url, options)
+
+	def quit(self) -> None:
+		try:
+			super().quit()
+		finally:
+			shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+def shared_service() -> ChromeService:
+	global _service
+	if _service is None:
+		service = ChromeService()
+		service.path = service.env_path() or DriverFinder(service, ChromeOptions()).get_driver_path()
+		service.start()
+		_service = service
+
+	return _service
+
+
+def launch_options(user_data_dir: str, headless: bool = True) -> ChromeOptions:
+	options = ChromeOptions()
+	# The fixtures wait for the app itself to be ready, so there is no point waiting for every subresource.
+	options.page_load_strategy = 'eager'
+	options.add_argument(f'--user-data-dir={user_data_dir}')
+	for switch in STARTUP_SWITCHES:
+		options.add_argument(switch)
+	if headless:
+		options.add_argument('--headless=new')
+
+	return options
+
+
+def _write_preferences(user_data_dir: str, preferences: dict) -> None:
+	path = os.path.join(user_data_dir, 'Default', 'Preferences')
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+
+	current = {}
+	if os.path.exists(path):
+		with open(path) as file:
+			current = json.load(file)
+
+	with open(path, 'w') as file:
+		json.dump(_merge(current, preferences), file)
+
+
+def _merge(base: dict, update: dict) -> dict:
+	merged = dict(base)
+	for key, value in update.items():
+		if isinstance(value, dict) and isinstance(merged.get(key), dict):
+			merged[key] = _merge(merged[key], value)
+		else:
+			merged[key] = value
+
+	return merged
+
+
+def profile_template() -> str:
+	"""Create (once per worker) a user-data-dir that has already been through Chrome's first start."""
+	global _template_dir
+	if _template_dir is not None:
+		return _template_dir
+
+	template_dir = tempfile.mkdtemp(prefix='weather-e2e-template-')
+	with open(os.path.join(template_dir, 'First Run'), 'w'):
+		pass
+	_write_preferences(template_dir, PROFILE_PREFERENCES)
+
+	seed = ChromeSession(shared_service().service_url, launch_options(template_dir))
+	seed.get('about:blank')
+	seed.quit()
+
+	_template_dir = template_dir
+	return _template_dir
+
+
+def new_profile(geolocation: int | None = None) -> str:
+	user_data_dir = tempfile.mkdtemp(prefix='weather-e2e-profile-')
+	shutil.copytree(
+		profile_template(), user_data_dir, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*_TEMPLATE_SKIP)
+	)
+
+	if geolocation is not None:
+		_write_preferences(
+			user_data_dir, {'profile': {'default_content_setting_values': {'geolocation': geolocation}}}
+		)
+
+	return user_data_dir
+
+
+def new_session(geolocation: int | None = None, headless: bool = True) -> ProfiledSession:
+	user_data_dir = new_profile(geolocation)
+	try:
+		return ProfiledSession(shared_service().service_url, launch_options(user_data_dir, headless), user_data_dir)
+	except Exception:
+		shutil.rmtree(user_data_dir, ignore_errors=True)
+		raise
+
+
+def shutdown() -> None:
+	global _service, _template_dir
+	if _service is not None:
+		_service.stop()
+		_service = None
+	if _template_dir is not None:
+		shutil.rmtree(_template_dir, ignore_errors=True)
+		_template_dir = None
+
+
+def _timed(launch: Callable[[], WebDriver]) -> float:
+	start = time.perf_counter()
+	driver = launch()
+	driver.get('about:blank')
+	elapsed = time.perf_counter() - start
+	driver.quit()
+	return elapsed
+
+
+def _report(name: str, samples: list[float]) -> None:
+	print(
+		f'{name:<34} n={len(samples):<3} min={min(samples) * 1000:8.1f} ms  '
+		f'median={statistics.median(samples) * 1000:8.1f} ms  max={max(samples) * 1000:8.1f} ms'
+	)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=5, help='Warm launches measured per configuration.')
+	parser.add_argument('--headed', action='store_true', help='Launch visible browser windows.')
+	args = parser.parse_args()
+	headless = not args.headed
+
+	try:
+		baseline = [
+			_timed(lambda: webdriver.Chrome(options=chrome_options(headless=headless))) for _ in range(args.runs)
+		]
+		cold = _timed(lambda: new_session(headless=headless))
+		warm = [_timed(lambda: new_session(headless=headless)) for _ in range(args.runs)]
+	finally:
+		shutdown()
+
+	_report('webdriver.Chrome() (default)', baseline)
+	_report('launch profile, cold', [cold])
+	_report('launch profile, warm', warm)
+
+
+if __name__ == '__main__':
+	main()
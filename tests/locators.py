@@ -0,0 +1,196 @@
+"""Locator registry: every logical element of the weather page with its candidate lookup strategies.
+
+The selectors resolve an element with the strategy chosen for it in `tests/locators.json`, or with the first
+(original) candidate when there is no choice on record. Run as a module to benchmark the candidates against the
+live page at `URL`; candidates that resolve to other nodes than the first one are rejected and the fastest of
+the rest is recorded:
+
+    python -m tests.locators --runs 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
+
+load_dotenv()
+url = os.getenv("URL")
+
+CHOICES_FILE = Path(__file__).with_name('locators.json')
+
+
+@dataclass(frozen=True)
+class Strategy:
+	name: str
+	by: str
+	value: str
+
+
+@dataclass(frozen=True)
+class Locator:
+	name: str
+	strategies: tuple[Strategy, ...]
+	multiple: bool = False
+
+
+LOCATORS = {
+	locator.name: locator for locator in (
+		Locator('user_location', (
+			Strategy('xpath', By.XPATH, "//div[h3[contains(text(), 'Your location')]]//tbody//th"),
+			Strategy('xpath_from_heading', By.XPATH, "//h3[contains(text(), 'Your location')]/..//tbody//th"),
+		), multiple=True),
+		Locator('selected_location', (
+			Strategy('xpath', By.XPATH, (
+				"//div[h3[contains(text(), 'Selected location')]]"
+				"//input[@id='latitude-input' or @id='longitude-input']"
+			)),
+			Strategy('css_ids', By.CSS_SELECTOR, 'input#latitude-input, input#longitude-input'),
+		), multiple=True),
+		Locator('update_button', (
+			Strategy('xpath', By.XPATH, "//button[text()='Update location']"),
+			Strategy('xpath_buttons_only', By.XPATH, "//button[.='Update location']"),
+		)),
+		Locator('error_alerts', (
+			Strategy('xpath', By.XPATH, "//div[contains(@class, 'alert-danger') and @role='alert']"),
+			Strategy('css', By.CSS_SELECTOR, "div.alert-danger[role='alert']"),
+		), multiple=True),
+		Locator('forecast_table', (
+			Strategy('xpath', By.XPATH, "//div[contains(@class, 'overflow-x-auto')]//table"),
+			Strategy('css', By.CSS_SELECTOR, 'div.overflow-x-auto table'),
+		)),
+		Locator('summary', (
+			Strategy('xpath', By.XPATH, (
+				"//div[contains(@class, 'row mb-3') and .//div[contains(@class, 'col-12 col-md-6 col-lg-3')]]"
+			)),
+			Strategy('css_has', By.CSS_SELECTOR, 'div.row.mb-3:has(div.col-12.col-md-6.col-lg-3)'),
+		)),
+	)
+}
+
+# Resolves one strategy `runs` times in the page and returns the mean time per resolution and the nodes found.
+_TIMING_SCRIPT = """
+const [using, value, runs] = arguments;
+const resolve = using === 'xpath'
+	? () => {
+		const result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+		return Array.from({length: result.snapshotLength}, (_, index) => result.snapshotItem(index));
+	}
+	: () => [...document.querySelectorAll(value)];
+const started = performance.now();
+for (let run = 0; run < runs; run++) {
+	resolve();
+}
+return [(performance.now() - started) / runs, resolve()];
+"""
+
+_choices: dict[str, str] | None = None
+
+
+def _load_choices() -> dict[str, str]:
+	global _choices
+	if _choices is None:
+		_choices = {}
+		if CHOICES_FILE.exists():
+			recorded = json.loads(CHOICES_FILE.read_text())
+			_choices = {name: result['chosen'] for name, result in recorded.items() if result.get('chosen')}
+
+	return _choices
+
+
+def strategy(name: str) -> Strategy:
+	locator = LOCATORS[name]
+	chosen = _load_choices().get(name)
+	return next((candidate for candidate in locator.strategies if candidate.name == chosen), locator.strategies[0])
+
+
+def find(driver: WebDriver, name: str, timeout: int) -> WebElement | list[WebElement]:
+	"""Wait for the element to be present and return it (or all matches for a `multiple` locator)."""
+	chosen = strategy(name)
+	first = WebDriverWait(driver, timeout).until(
+		expected_conditions.presence_of_element_located((chosen.by, chosen.value))
+	)
+
+	return driver.find_elements(chosen.by, chosen.value) if LOCATORS[name].multiple else first
+
+
+def time_strategy(driver: WebDriver, locator: Locator, candidate: Strategy, runs: int) -> tuple[float, list[str]]:
+	mean_ms, nodes = driver.execute_script(_TIMING_SCRIPT, candidate.by, candidate.value, runs)
+	ids = [node.id for node in nodes]
+	return mean_ms, ids if locator.multiple else ids[:1]
+
+
+def benchmark(driver: WebDriver, locator: Locator, runs: int, repeats: int) -> dict:
+	timings: dict[str, float] = {}
+	nodes: dict[str, list[str]] = {}
+	for candidate in locator.strategies:
+		samples = []
+		for _ in range(repeats):
+			mean_ms, nodes[candidate.name] = time_strategy(driver, locator, candidate, runs)
+			samples.append(mean_ms)
+		timings[candidate.name] = statistics.median(samples)
+
+	reference = nodes[locator.strategies[0].name]
+	correct = [name for name in timings if reference and nodes[name] == reference]
+	return {
+		'chosen': min(correct, key=timings.get) if correct else None,
+		'median_ms': {name: round(value, 4) for name, value in timings.items()},
+		'rejected': [name for name in timings if name not in correct],
+	}
+
+
+def _show_error_alerts(driver: WebDriver, timeout: int) -> None:
+	latitude = find(driver, 'selected_location', timeout)[0]
+	latitude.clear()
+	latitude.send_keys('1000')
+	find(driver, 'update_button', timeout).click()
+	find(driver, 'error_alerts', timeout)
+
+
+def main() -> None:
+	from tests import launch
+	from tests.selectors import wait_for_app_ready
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=200, help='In-page resolutions per timing sample.')
+	parser.add_argument('--repeats', type=int, default=5, help='Timing samples per strategy (median is kept).')
+	parser.add_argument('--timeout', type=int, default=15)
+	parser.add_argument('--output', default=str(CHOICES_FILE), help='Where to record the chosen strategies.')
+	parser.add_argument('--headed', action='store_true', help='Launch a visible browser window.')
+	args = parser.parse_args()
+
+	driver = launch.new_session(headless=not args.headed)
+	try:
+		driver.get(url)
+		wait_for_app_ready(driver, args.timeout)
+
+		results = {}
+		# The alerts only exist after an invalid update, which changes the page, so they are measured last.
+		for name in sorted(LOCATORS, key=lambda name: name == 'error_alerts'):
+			if name == 'error_alerts':
+				_show_error_alerts(driver, args.timeout)
+			results[name] = benchmark(driver, LOCATORS[name], args.runs, args.repeats)
+	finally:
+		driver.quit()
+		launch.shutdown()
+
+	for name, result in results.items():
+		timings = '  '.join(f"{candidate}={ms:.4f} ms" for candidate, ms in result['median_ms'].items())
+		rejected = f"  rejected: {', '.join(result['rejected'])}" if result['rejected'] else ''
+		print(f"{name:<18} chosen={result['chosen']}  {timings}{rejected}")
+
+	with open(args.output, 'w') as file:
+		json.dump(results, file, indent='\t')
+		file.write('\n')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,167 @@
+"""Page object for the weather page.
+
+Resolved element handles are cached per page, so repeated lookups in a test cost nothing. A handle is resolved
+again only after a stale-element error or after an action that is known to re-render part of the page
+(`MUTATIONS`). Collections (the alerts, the table rows, the location inputs) are never cached: the page can add
+members to them without any action of ours, such as an alert rendered after the first lookup. `stats()` counts
+cache hits, misses and stale handles.
+"""
+
+from functools import wraps
+from typing import Callable, TypeVar
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from tests import tracing
+from tests.selectors import (
+	find_error_messages,
+	find_selected_location,
+	find_update_button,
+	find_user_location,
+	find_week_forecast_table,
+	find_week_summary_div,
+)
+
+T = TypeVar('T')
+
+Handle = WebElement | list[WebElement]
+
+# Elements that an action re-renders; their cached handles are dropped when the action runs.
+MUTATIONS = {
+	'update_location': ('forecast_table', 'summary'),
+}
+
+# Handles resolved from inside another cached element go stale together with it.
+_PARENTS = {
+	'table_headers': 'forecast_table',
+	'table_rows': 'forecast_table',
+}
+
+
+def _step(method: Callable[..., T]) -> Callable[..., T]:
+	"""Record the action as a span (a test step in the trace and in the console capture of tests/console.py)."""
+
+	@wraps(method)
+	def wrapper(self: 'WeatherPage', *args, **kwargs) -> T:
+		with tracing.span(f'WeatherPage.{method.__name__}', 'page', tracing.track_for(self.driver)):
+			return method(self, *args, **kwargs)
+
+	return wrapper
+
+
+class WeatherPage:
+	def __init__(self, driver: WebDriver, timeout: int) -> None:
+		self.driver = driver
+		self.timeout = timeout
+		self.hits = 0
+		self.misses = 0
+		self.stale = 0
+		self._handles: dict[str, Handle] = {}
+		self._resolvers: dict[str, Callable[[], Handle]] = {
+			'user_location': lambda: find_user_location(driver, timeout),
+			'location_inputs': lambda: find_selected_location(driver, timeout),
+			'update_button': lambda: find_update_button(driver, timeout),
+			'error_alerts': lambda: find_error_messages(driver, timeout),
+			'forecast_table': lambda: find_week_forecast_table(driver, timeout),
+			'table_headers': lambda: self.forecast_table.find_element(By.TAG_NAME, 'tr').find_elements(
+				By.CLASS_NAME, 'align-middle'
+			),
+			'table_rows': lambda: self.forecast_table.find_element(By.TAG_NAME, 'tbody').find_elements(
+				By.TAG_NAME, 'tr'
+			),
+			'summary': lambda: find_week_summary_div(driver, timeout),
+		}
+
+	def element(self, name: str) -> Handle:
+		if name in self._handles:
+			self.hits += 1
+			return self._handles[name]
+
+		self.misses += 1
+		handle = self._resolvers[name]()
+		if not isinstance(handle, list):
+			self._handles[name] = handle
+		return handle
+
+	def invalidate(self, *names: str) -> None:
+		for name in names or tuple(self._handles):
+			self._handles.pop(name, None)
+
+	def _use(self, name: str, action: Callable[[Handle], T]) -> T:
+		try:
+			return action(self.element(name))
+		except StaleElementReferenceException:
+			self.stale += 1
+			root = _PARENTS.get(name, name)
+			self.invalidate(root, *(child for child, parent in _PARENTS.items() if parent == root))
+			return action(self.element(name))
+
+	def stats(self) -> dict[str, int]:
+		return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale}
+
+	@property
+	def forecast_table(self) -> WebElement:
+		return self.element('forecast_table')
+
+	@_step
+	def user_location(self) -> list[tuple[str, bool]]:
+		"""Text and visibility of the latitude and longitude cells of the user's location."""
+		return self._use('user_location', lambda cells: [(cell.text, cell.is_displayed()) for cell in cells])
+
+	@_step
+	def update_button_displayed(self) -> bool:
+		return self._use('update_button', lambda button: button.is_displayed())
+
+	@_step
+	def update_button_enabled(self) -> bool:
+		return self._use('update_button', lambda button: button.is_enabled())
+
+	@_step
+	def location_inputs_displayed(self) -> tuple[bool, bool]:
+		latitude, longitude = self._use('location_inputs', lambda inputs: [field.is_displayed() for field in inputs])
+		return latitude, longitude
+
+	@_step
+	def location_values(self) -> tuple[str, str]:
+		latitude, longitude = self._use(
+			'location_inputs', lambda inputs: [field.get_attribute('value') for field in inputs]
+		)
+		return latitude, longitude
+
+	@_step
+	def enter_location(self, latitude: object = None, longitude: object = None) -> None:
+		for value, index in ((latitude, 0), (longitude, 1)):
+			if value is not None:
+				self._use('location_inputs', lambda inputs: self._type(inputs[index], str(value)))
+
+	@staticmethod
+	def _type(field: WebElement, text: str) -> None:
+		field.clear()
+		field.send_keys(text)
+
+	@_step
+	def update_location(self) -> None:
+		self._use('update_button', lambda button: button.click())
+		self.invalidate(*MUTATIONS['update_location'])
+
+	@_step
+	def table_header_texts(self) -> list[str]:
+		return self._use('table_headers', lambda headers: [th.text for th in headers])
+
+	@_step
+	def table_body_texts(self) -> list[list[str]]:
+		return self._use(
+			'table_rows', lambda rows: [[cell.text for cell in row.find_elements(By.TAG_NAME, 'th')] for row in rows]
+		)
+
+	@_step
+	def summary_text(self) -> str:
+		return self._use('summary', lambda summary: summary.text)
+
+	@_step
+	def error_messages(self) -> list[tuple[str, bool]]:
+		"""Text and visibility of every error alert."""
+		return self._use('error_alerts', lambda alerts: [(alert.text, alert.is_displayed()) for alert in alerts])
@@ -0,0 +1,281 @@
+"""Per-test Chrome and chromedriver resource usage, sampled from /proc.
+
+Every test on a worker runs in its own browser context of the same long-lived Chrome, so the browser process tree
+as a whole carries the state of earlier tests. While a test runs, a background thread samples that tree from /proc
+and attributes to the test only the renderer processes started during it: a browser context never shares a renderer
+with another one, so these are the renderers of the test's own pages. Their CPU time, resident memory and process
+count (peak and average) are attached to the test report as the `resources` user property (and so end up in JUnit
+XML), together with the peak of the whole tree and its chromedriver (`browser_peak_rss_mb`), which is a per-worker
+figure. The terminal summary lists the heaviest tests and how many workers fit in a RAM limit.
+"""
+
+import os
+import threading
+from dataclasses import asdict, dataclass
+
+import pytest
+from _pytest.reports import TestReport
+from _pytest.terminal import TerminalReporter
+
+from tests import contexts
+
+PROC = '/proc'
+
+SAMPLE_INTERVAL_SECONDS = 0.05
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+@dataclass(frozen=True)
+class ProcessSample:
+	pid: int
+	ppid: int
+	cpu_seconds: float
+	rss_bytes: int
+
+
+@dataclass
+class ResourceUsage:
+	cpu_seconds: float
+	peak_rss_mb: float
+	average_rss_mb: float
+	peak_processes: int
+	average_processes: float
+	samples: int
+	browser_peak_rss_mb: float
+
+
+def available() -> bool:
+	return os.path.isdir(os.path.join(PROC, 'self'))
+
+
+def _read(path: str) -> str | None:
+	try:
+		with open(path) as file:
+			return file.read()
+	except OSError:
+		return None
+
+
+def read_process(pid: int) -> ProcessSample | None:
+	stat = _read(f'{PROC}/{pid}/stat')
+	statm = _read(f'{PROC}/{pid}/statm')
+	if stat is None or statm is None:
+		return None
+
+	# The command name in parentheses may itself contain spaces and parentheses.
+	fields = stat[stat.rindex(')') + 2:].split()
+	return ProcessSample(
+		pid=pid,
+		ppid=int(fields[1]),
+		cpu_seconds=(int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+		rss_bytes=int(statm.split()[1]) * _PAGE_SIZE,
+	)
+
+
+def all_processes() -> dict[int, ProcessSample]:
+	processes = {}
+	for name in os.listdir(PROC):
+		if name.isdigit():
+			sample = read_process(int(name))
+			if sample is not None:
+				processes[sample.pid] = sample
+
+	return processes
+
+
+def descendants(root: int, processes: dict[int, ProcessSample]) -> set[int]:
+	children: dict[int, list[int]] = {}
+	for sample in processes.values():
+		children.setdefault(sample.ppid, []).append(sample.pid)
+
+	tree, pending = set(), [root]
+	while pending:
+		pid = pending.pop()
+		if pid in processes and pid not in tree:
+			tree.add(pid)
+			pending.extend(children.get(pid, ()))
+
+	return tree
+
+
+def browser_pid(user_data_dir: str) -> int | None:
+	"""The Chrome browser process started with this user-data-dir (renderers do not get the switch)."""
+	switch = f'--user-data-dir={user_data_dir}'.encode()
+	for name in os.listdir(PROC):
+		if not name.isdigit():
+			continue
+		try:
+			with open(f'{PROC}/{name}/cmdline', 'rb') as file:
+				arguments = file.read().split(b'\0')
+		except OSError:
+			continue
+		if switch in arguments and b'--type' not in b' '.join(arguments):
+			return int(name)
+
+	return None
+
+
+def is_renderer(pid: int) -> bool:
+	arguments = (_read(f'{PROC}/{pid}/cmdline') or '').split('\0')
+	return '--type=renderer' in arguments
+
+
+class _Sampler(threading.Thread):
+	def __init__(self, browser: int | None, interval: float) -> None:
+		super().__init__(name='resource-sampler', daemon=True)
+		self.browser = browser
+		self.interval = interval
+		self.stopped = threading.Event()
+		# Processes of the tree from before the test; unknown until the first sample of a running browser. A browser
+		# that is only launched by this test's fixtures started with nothing of earlier tests in it.
+		self.existing: set[int] | None = None if browser is not None else set()
+		self.renderers: set[int] = set()
+		self.cpu_last: dict[int, float] = {}
+		self.rss: list[int] = []
+		self.counts: list[int] = []
+		self.browser_rss: list[int] = []
+
+	def sample(self) -> None:
+		if self.browser is None:
+			return
+
+		processes = all_processes()
+		tree = descendants(self.browser, processes)
+		if self.existing is None:
+			self.existing = set(tree)
+		# chromedriver itself, but not the other browsers it may be driving (the daemon serves a whole pool).
+		browser = processes.get(self.browser)
+		if browser is not None and browser.ppid in processes:
+			tree.add(browser.ppid)
+
+		# Only a positive answer is kept: a process forked from the zygote shows the zygote's command line at first.
+		for pid in tree - self.existing - self.renderers:
+			if is_renderer(pid):
+				self.renderers.add(pid)
+		own = tree & self.renderers
+
+		# The renderers started during the test, so all of their CPU time is the test's.
+		for pid in own:
+			self.cpu_last[pid] = processes[pid].cpu_seconds
+		self.rss.append(sum(processes[pid].rss_bytes for pid in own))
+		self.counts.append(len(own))
+		self.browser_rss.append(sum(processes[pid].rss_bytes for pid in tree))
+
+	def run(self) -> None:
+		self.sample()
+		while not self.stopped.wait(self.interval):
+			self.sample()
+
+	def stop(self) -> ResourceUsage:
+		self.stopped.set()
+		self.join()
+		self.sample()
+
+		mb = 1024 * 1024
+		return ResourceUsage(
+			cpu_seconds=round(sum(self.cpu_last.values()), 3),
+			peak_rss_mb=round(max(self.rss, default=0) / mb, 1),
+			average_rss_mb=round(sum(self.rss) / len(self.rss) / mb, 1) if self.rss else 0.0,
+			peak_processes=max(self.counts, default=0),
+			average_processes=round(sum(self.counts) / len(self.counts), 1) if self.counts else 0.0,
+			samples=len(self.rss),
+			browser_peak_rss_mb=round(max(self.browser_rss, default=0) / mb, 1),
+		)
+
+
+def _current_browser() -> int | None:
+	host = contexts.current()
+	if host is None:
+		return None
+
+	user_data_dir = host.driver.caps.get('chrome', {}).get('userDataDir')
+	return browser_pid(user_data_dir) if user_data_dir else None
+
+
+def _runner_rss_mb() -> float:
+	sample = read_process(os.getpid())
+	return round(sample.rss_bytes / 1024 / 1024, 1) if sample else 0.0
+
+
+def _memory_available_mb() -> float | None:
+	for line in (_read(f'{PROC}/meminfo') or '').splitlines():
+		if line.startswith('MemAvailable:'):
+			return int(line.split()[1]) / 1024
+
+	return None
+
+
+class ResourceMonitor:
+	"""pytest plugin: samples the renderers of every test, and the browser tree it shares, from setup to teardown."""
+
+	def __init__(self, ram_limit_mb: float | None, top: int = 10, interval: float = SAMPLE_INTERVAL_SECONDS) -> None:
+		self.ram_limit_mb = ram_limit_mb
+		self.top = top
+		self.interval = interval
+		self.usage: dict[str, dict] = {}
+		self._sampler: _Sampler | None = None
+		self._browser: int | None = None
+
+	def _start(self) -> None:
+		# The worker's browser is launched lazily by the first fixture that needs it.
+		if self._browser is None or read_process(self._browser) is None:
+			self._browser = _current_browser()
+		self._sampler = _Sampler(self._browser, self.interval)
+		self._sampler.start()
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_setup(self, item: pytest.Item) -> object:
+		self._start()
+		try:
+			return (yield)
+		finally:
+			if self._sampler.browser is None:
+				# First test of the worker: the browser only exists now that the fixtures have run.
+				self._sampler.browser = self._browser = _current_browser()
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_runtest_teardown(self, item: pytest.Item) -> object:
+		try:
+			return (yield)
+		finally:
+			if self._sampler is not None:
+				usage = asdict(self._sampler.stop())
+				usage['runner_rss_mb'] = _runner_rss_mb()
+				item.user_properties.append(('resources', usage))
+				self._sampler = None
+
+	def pytest_runtest_logreport(self, report: TestReport) -> None:
+		if report.when != 'teardown':
+			return
+
+		for name, value in report.user_properties:
+			if name == 'resources':
+				self.usage[report.nodeid] = value
+
+	def workers_for(self, limit_mb: float) -> int:
+		per_worker = max(usage['browser_peak_rss_mb'] + usage['runner_rss_mb'] for usage in self.usage.values())
+		return int(limit_mb // per_worker) if per_worker else 0
+
+	def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+		if not self.usage:
+			return
+
+		terminalreporter.section('browser resources')
+		terminalreporter.write_line('renderers started by each test; browser and chromedriver are shared per worker')
+		heaviest = sorted(self.usage.items(), key=lambda entry: entry[1]['peak_rss_mb'], reverse=True)[:self.top]
+		for nodeid, usage in heaviest:
+			terminalreporter.write_line(
+				f"{usage['peak_rss_mb']:8.1f} MB peak  {usage['average_rss_mb']:8.1f} MB avg  "
+				f"{usage['cpu_seconds']:6.2f}s CPU  {usage['peak_processes']:3d} renderers  {nodeid}"
+			)
+
+		limit_mb = self.ram_limit_mb or _memory_available_mb()
+		if limit_mb:
+			source = '--ram-limit' if self.ram_limit_mb else 'MemAvailable'
+			terminalreporter.write_line(
+				f"workers that fit in {limit_mb:.0f} MB ({source}): {self.workers_for(limit_mb)} "
+				f"(-n), at the heaviest browser tree plus its pytest process"
+			)
+
@@ -0,0 +1,171 @@
+"""Skip tests that already passed against the same frontend build and the same test code.
+
+The frontend fingerprint covers the hashed asset names referenced by the page at `URL` and the digests of the
+bundles themselves; each test adds the hashes of its module and of the shared test support code (plus any other
+support files the caller names, such as baselines), and the values of the run options the caller names as changing
+what a passing test has checked.
+"""
+
+import hashlib
+import time
+import urllib.error
+import urllib.request
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import pytest
+from _pytest.config import Config
+from _pytest.reports import TestReport
+from _pytest.terminal import TerminalReporter
+
+CACHE_KEY = 'weather_e2e/result_cache'
+
+TESTS_DIR = Path(__file__).parent
+
+
+class _AssetParser(HTMLParser):
+	def __init__(self) -> None:
+		super().__init__()
+		self.assets: list[str] = []
+
+	def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+		attributes = dict(attrs)
+		if tag == 'script' and attributes.get('src'):
+			self.assets.append(attributes['src'])
+		elif tag == 'link' and attributes.get('href') and attributes.get('rel') in ('stylesheet', 'modulepreload'):
+			self.assets.append(attributes['href'])
+
+
+def _fetch(url: str, timeout: float) -> bytes:
+	with urllib.request.urlopen(url, timeout=timeout) as response:
+		return response.read()
+
+
+def frontend_fingerprint(url: str, timeout: float = 10) -> str:
+	parser = _AssetParser()
+	parser.feed(_fetch(url, timeout).decode('utf-8', errors='replace'))
+
+	digest = hashlib.sha256()
+	origin = urlparse(url).netloc
+	for asset in sorted(urljoin(url, asset) for asset in parser.assets):
+		digest.update(asset.encode())
+		if urlparse(asset).netloc == origin:
+			digest.update(hashlib.sha256(_fetch(asset, timeout)).digest())
+
+	return digest.hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+	return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def support_fingerprint(extra_globs: tuple[str, ...] = ()) -> str:
+	"""Digest of the support code in tests/ and of the files matching `extra_globs` (relative to tests/)."""
+	digest = hashlib.sha256()
+	paths = [path for pattern in ('*.py', '*.json', *extra_globs) for path in TESTS_DIR.glob(pattern)]
+	for path in sorted(set(paths)):
+		if not path.name.startswith('test_'):
+			digest.update(path.relative_to(TESTS_DIR).as_posix().encode())
+			digest.update(_file_digest(path).encode())
+
+	return digest.hexdigest()
+
+
+class ResultCache:
+	"""pytest plugin: skips cached passes at collection and records new results as reports come in."""
+
+	def __init__(
+			self,
+			config: Config,
+			url: str,
+			window_hours: float,
+			force: bool,
+			record: bool = True,
+			run_options: tuple[str, ...] = (),
+			support_globs: tuple[str, ...] = (),
+	) -> None:
+		self.cache = config.cache
+		self.rootpath = config.rootpath
+		self.url = url
+		self.window_seconds = window_hours * 3600
+		self.force = force
+		self.record = record
+		self.options = ' '.join(f'{name}={config.getoption(name)!r}' for name in run_options)
+		self.support_globs = support_globs
+		self.results: dict[str, dict] = self.cache.get(CACHE_KEY, {})
+		self.skipped: list[str] = []
+		self._frontend: str | None = None
+		self._support: str | None = None
+		self._modules: dict[str, str] = {}
+		self.unavailable_reason: str | None = None
+
+	def frontend(self) -> str | None:
+		if self._frontend is None and self.unavailable_reason is None:
+			try:
+				self._frontend = frontend_fingerprint(self.url)
+			except (urllib.error.URLError, OSError, ValueError) as e:
+				self.unavailable_reason = f"could not fingerprint {self.url}: {e}"
+
+		return self._frontend
+
+	def fingerprint(self, nodeid: str) -> str | None:
+		frontend = self.frontend()
+		if frontend is None:
+			return None
+
+		if self._support is None:
+			self._support = support_fingerprint(self.support_globs)
+		module = nodeid.split('::')[0]
+		if module not in self._modules:
+			self._modules[module] = _file_digest(self.rootpath / module)
+
+		return hashlib.sha256(f'{frontend}:{self._support}:{self._modules[module]}:{self.options}'.encode()).hexdigest()
+
+	def skip_reason(self, nodeid: str) -> str | None:
+		if self.force or self.window_seconds <= 0:
+			return None
+
+		result = self.results.get(nodeid)
+		if result is None or result['fingerprint'] != self.fingerprint(nodeid):
+			return None
+
+		age = time.time() - result['passed_at']
+		if age > self.window_seconds:
+			return None
+
+		return (
+			f"passed {age / 3600:.1f}h ago against frontend build {self.frontend()[:12]} "
+			f"(--force-full-run to run it anyway)"
+		)
+
+	def pytest_collection_modifyitems(self, items: list[pytest.Item]) -> None:
+		for item in items:
+			reason = self.skip_reason(item.nodeid)
+			if reason is not None:
+				item.add_marker(pytest.mark.skip(reason=reason))
+				self.skipped.append(item.nodeid)
+
+	def pytest_runtest_logreport(self, report: TestReport) -> None:
+		if not self.record:
+			return
+
+		if report.failed:
+			self.results.pop(report.nodeid, None)
+		elif report.when == 'call' and report.passed:
+			fingerprint = self.fingerprint(report.nodeid)
+			if fingerprint is not None:
+				self.results[report.nodeid] = {'fingerprint': fingerprint, 'passed_at': time.time()}
+
+	def pytest_sessionfinish(self) -> None:
+		if self.record:
+			self.cache.set(CACHE_KEY, self.results)
+
+	def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+		if self.unavailable_reason:
+			terminalreporter.write_line(f"result cache disabled: {self.unavailable_reason}", yellow=True)
+		elif self.skipped:
+			terminalreporter.write_line(
+				f"result cache: skipped {len(self.skipped)} test(s) that already passed against frontend build "
+				f"{self.frontend()[:12]}"
+			)
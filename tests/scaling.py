@@ -0,0 +1,300 @@
+"""Forecast-horizon scaling benchmark against a local stand-in backend.
+
+The frontend at `URL` is loaded once as is, to record the backend's forecast response. That response becomes
+the template of a local stand-in backend, which serves it stretched to 7, 14, 30 and 90 days: every 7-item
+array (one item per day) is cycled to the horizon and date strings are moved to the matching day. The page's
+backend requests are redirected to the stand-in through DevTools request interception, and for every horizon
+the benchmark measures payload size, JSON parse time, click-to-render time of Update location, JS heap and DOM
+size. A power law `metric ~ days^k` is fitted to each metric; `k` well above 1 means super-linear growth:
+
+    python -m tests.scaling --horizons 7 14 30 90 --renders 5
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import re
+import statistics
+import threading
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import trio
+from dotenv import load_dotenv
+from selenium.common import TimeoutException
+
+from tests import async_driver, launch
+from tests.devtools import browser_websocket_url
+from tests.selectors import APP_READY_PREDICATE, update_location_script
+
+load_dotenv()
+url = os.getenv("URL")
+
+HORIZONS = (7, 14, 30, 90)
+
+TEMPLATE_DAYS = 7
+
+# Exponents above this are reported as super-linear growth.
+SUPERLINEAR = 1.3
+
+_DATE = re.compile(r'^(\d{4}-\d{2}-\d{2})(.*)$')
+
+_INTERCEPTED = [{'urlPattern': '*', 'resourceType': kind, 'requestStage': 'Request'} for kind in ('Fetch', 'XHR')]
+
+_PARSE_SCRIPT = """
+((text, runs) => {
+	const started = performance.now();
+	for (let run = 0; run < runs; run++) {
+		JSON.parse(text);
+	}
+	return (performance.now() - started) / runs;
+})
+"""
+
+_TABLE_SIZE = """
+(() => {
+	const table = document.querySelector('div.overflow-x-auto table');
+	return {
+		columns: table ? table.querySelector('tr').querySelectorAll('.align-middle').length : 0,
+		dom_nodes: document.getElementsByTagName('*').length,
+	};
+})()
+"""
+
+
+def _shift(value: object, days: int) -> object:
+	"""Move every ISO date string inside `value` by `days`."""
+	if isinstance(value, str):
+		match = _DATE.match(value)
+		if match:
+			moved = date.fromisoformat(match.group(1)) + timedelta(days=days)
+			return moved.isoformat() + match.group(2)
+		return value
+	if isinstance(value, list):
+		return [_shift(item, days) for item in value]
+	if isinstance(value, dict):
+		return {key: _shift(item, days) for key, item in value.items()}
+	return value
+
+
+def stretch(value: object, days: int, offset: int = 0) -> object:
+	"""Cycle every per-day array of the template to `days` items; `offset` rotates which day each cycle starts on."""
+	if isinstance(value, list) and len(value) == TEMPLATE_DAYS:
+		stretched = []
+		for index in range(days):
+			source = (index + offset) % TEMPLATE_DAYS
+			stretched.append(_shift(stretch(value[source], days, offset), index - source))
+		return stretched
+	if isinstance(value, list):
+		return [stretch(item, days, offset) for item in value]
+	if isinstance(value, dict):
+		return {key: stretch(item, days, offset) for key, item in value.items()}
+	return value
+
+
+class StandIn:
+	"""Local HTTP server answering every GET with the template stretched to the current horizon."""
+
+	def __init__(self, template: object) -> None:
+		self.template = template
+		self.days = TEMPLATE_DAYS
+		self.requests = 0
+		self.last_body = b''
+		self.lock = threading.Lock()
+
+		stand_in = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def _headers(self, status: HTTPStatus, length: int = 0) -> None:
+				self.send_response(status)
+				self.send_header('Access-Control-Allow-Origin', '*')
+				self.send_header('Access-Control-Allow-Headers', '*')
+				self.send_header('Content-Type', 'application/json')
+				self.send_header('Content-Length', str(length))
+				self.end_headers()
+
+			def do_OPTIONS(self) -> None:  # noqa: N802
+				self._headers(HTTPStatus.NO_CONTENT)
+
+			def do_GET(self) -> None:  # noqa: N802
+				body = stand_in.body()
+				self._headers(HTTPStatus.OK, len(body))
+				self.wfile.write(body)
+
+			def log_message(self, format: str, *args) -> None:
+				pass
+
+		self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+		self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+	def body(self) -> bytes:
+		with self.lock:
+			# Every answer starts the week on another day, so each Update location renders something new.
+			offset = self.requests % TEMPLATE_DAYS
+			self.requests += 1
+			self.last_body = json.dumps(stretch(self.template, self.days, offset)).encode()
+			return self.last_body
+
+	def close(self) -> None:
+		self.server.shutdown()
+		self.server.server_close()
+
+
+async def record_backend(browser: async_driver.AsyncBrowser, timeout: int) -> tuple[str, object]:
+	"""Load the page against the real backend and return the first JSON response and its URL."""
+	async with browser.tab() as tab:
+		paused = tab.listen('Fetch.requestPaused')
+		responses = [{**pattern, 'requestStage': 'Response'} for pattern in _INTERCEPTED]
+		await tab.send('Fetch.enable', {'patterns': responses})
+		await tab.send('Page.navigate', {'url': url})
+
+		try:
+			with trio.fail_after(timeout):
+				async for event in paused:
+					recorded = None
+					if 200 <= event.get('responseStatusCode', 0) < 300:
+						reply = await tab.send('Fetch.getResponseBody', {'requestId': event['requestId']})
+						body = base64.b64decode(reply['body']) if reply.get('base64Encoded') else reply['body']
+						try:
+							recorded = json.loads(body)
+						except ValueError:
+							pass
+					await tab.send('Fetch.continueRequest', {'requestId': event['requestId']})
+					if isinstance(recorded, (dict, list)):
+						return event['request']['url'], recorded
+		except trio.TooSlowError:
+			raise RuntimeError(f"{url} made no JSON request to record within {timeout}s") from None
+
+	raise RuntimeError(f"{url} made no JSON request to record")
+
+
+async def _redirect(paused: trio.MemoryReceiveChannel, tab: async_driver.Tab, backend: str, stand_in: StandIn) -> None:
+	"""Send the page's requests for the backend's origin to the stand-in, same path and query."""
+	origin = urlparse(backend).netloc
+	async for event in paused:
+		params = {'requestId': event['requestId']}
+		request = urlparse(event['request']['url'])
+		if request.netloc == origin:
+			params['url'] = stand_in.url + request.path + (f'?{request.query}' if request.query else '')
+		await tab.send('Fetch.continueRequest', params)
+
+
+async def measure_horizon(
+		browser: async_driver.AsyncBrowser, backend: str, stand_in: StandIn, days: int, renders: int, timeout: int
+) -> dict:
+	stand_in.days = days
+	async with browser.tab() as tab, trio.open_nursery() as nursery:
+		paused = tab.listen('Fetch.requestPaused')
+		await tab.send('Fetch.enable', {'patterns': _INTERCEPTED})
+		nursery.start_soon(_redirect, paused, tab, backend, stand_in)
+
+		await tab.goto(url, timeout)
+		await tab.wait_for(APP_READY_PREDICATE, timeout)
+
+		render_ms = []
+		for _ in range(renders):
+			timing = await tab.evaluate(update_location_script(timeout), timeout + 5)
+			if timing.get('outcome') != 'rendered':
+				nursery.cancel_scope.cancel()
+				return {'days': days, 'outcome': timing.get('outcome') or timing.get('error', 'error')}
+			render_ms.append(timing['renderMs'])
+
+		payload = stand_in.last_body.decode()
+		parse_ms = await tab.evaluate(f"({_PARSE_SCRIPT.strip()})({json.dumps(payload)}, 20)")
+
+		await tab.send('HeapProfiler.collectGarbage')
+		heap = await tab.send('Runtime.getHeapUsage')
+		table = await tab.evaluate(_TABLE_SIZE)
+		nursery.cancel_scope.cancel()
+
+	return {
+		'days': days,
+		'outcome': 'rendered',
+		'payload_bytes': len(stand_in.last_body),
+		'parse_ms': round(parse_ms, 4),
+		'render_ms': round(statistics.median(render_ms), 1),
+		'heap_bytes': heap['usedSize'],
+		'dom_nodes': table['dom_nodes'],
+		'rendered_columns': table['columns'],
+	}
+
+
+def fit_exponent(days: list[int], values: list[float]) -> float | None:
+	"""Least-squares slope of log(value) over log(days): the k of value ~ days^k."""
+	points = [(math.log(x), math.log(y)) for x, y in zip(days, values) if y and y > 0]
+	if len(points) < 2:
+		return None
+
+	mean_x = statistics.fmean(x for x, _ in points)
+	mean_y = statistics.fmean(y for _, y in points)
+	spread = sum((x - mean_x) ** 2 for x, _ in points)
+	return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else None
+
+
+async def benchmark(websocket_url: str, horizons: list[int], renders: int, timeout: int) -> list[dict]:
+	async with async_driver.connect(websocket_url) as browser:
+		backend, template = await record_backend(browser, timeout)
+		print(f"Recorded backend response from {backend}")
+
+		stand_in = StandIn(template)
+		results = []
+		try:
+			for days in horizons:
+				try:
+					results.append(await measure_horizon(browser, backend, stand_in, days, renders, timeout))
+				except (TimeoutException, trio.TooSlowError):
+					results.append({'days': days, 'outcome': 'timeout'})
+		finally:
+			stand_in.close()
+
+		return results
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--horizons', type=int, nargs='+', default=list(HORIZONS), help='Forecast lengths in days.')
+	parser.add_argument('--renders', type=int, default=5, help='Update location renders per horizon (median).')
+	parser.add_argument('--timeout', type=int, default=15)
+	parser.add_argument('--output', default=None, help='Also write the measurements and fits to this JSON file.')
+	parser.add_argument('--headed', action='store_true', help='Launch a visible browser window.')
+	args = parser.parse_args()
+
+	driver = launch.new_session(headless=not args.headed)
+	try:
+		results = trio.run(benchmark, browser_websocket_url(driver), args.horizons, args.renders, args.timeout)
+	except RuntimeError as e:
+		raise SystemExit(str(e))
+	finally:
+		driver.quit()
+		launch.shutdown()
+
+	metrics = ('payload_bytes', 'parse_ms', 'render_ms', 'heap_bytes', 'dom_nodes', 'rendered_columns')
+	print(f"{'days':>5} " + ' '.join(f"{metric:>16}" for metric in metrics))
+	for result in results:
+		if result['outcome'] != 'rendered':
+			print(f"{result['days']:>5} Update location ended with {result['outcome']}")
+			continue
+		print(f"{result['days']:>5} " + ' '.join(f"{result[metric]:>16}" for metric in metrics))
+
+	rendered = [result for result in results if result['outcome'] == 'rendered']
+	days = [result['days'] for result in rendered]
+	fits = {metric: fit_exponent(days, [result[metric] for result in rendered]) for metric in metrics}
+	for metric, exponent in fits.items():
+		if exponent is None:
+			print(f"{metric:<16} k = n/a")
+			continue
+		note = '  super-linear' if exponent > SUPERLINEAR else ''
+		print(f"{metric:<16} k = {exponent:5.2f}{note}")
+
+	if args.output:
+		with open(args.output, 'w') as file:
+			json.dump({'results': results, 'exponents': fits}, file, indent='\t')
+
+
+if __name__ == '__main__':
+	main()
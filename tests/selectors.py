@@ -1,86 +1,191 @@
+from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
 
+from tests import locators
+from tests.tracing import traced
 from tests.utils import handle_exceptions
 
-# TODO ids or data attributes for frontend rather than nested selectors
+# TODO ids or data attributes for frontend rather than nested selectors (add them as candidates in tests/locators.py)
+
+# True once the location panels, the forecast table and the week summary are all mounted and populated,
+# so a test can start without waiting for the "load" event or polling each element separately.
+APP_READY_PREDICATE = """
+() => {
+	const panel = title => [...document.querySelectorAll('div')].find(
+		div => [...div.children].some(child => child.tagName === 'H3' && child.textContent.includes(title))
+	);
+	const filled = elements => elements.length > 0 && elements.every(element => element.textContent.trim());
+	const userLocation = panel('Your location');
+	const selectedLocation = panel('Selected location');
+	const table = document.querySelector('div.overflow-x-auto table');
+	const summary = [...document.querySelectorAll('div.row.mb-3')].find(
+		div => div.querySelector('div.col-12.col-md-6.col-lg-3')
+	);
+	if (!userLocation || !selectedLocation || !table || !summary) {
+		return false;
+	}
+	const inputs = [...selectedLocation.querySelectorAll('#latitude-input, #longitude-input')];
+	return filled([...userLocation.querySelectorAll('tbody th')])
+		&& inputs.length === 2 && inputs.every(input => input.value !== '')
+		&& filled([...table.querySelectorAll('tbody tr')])
+		&& filled([...summary.querySelectorAll('div.col-12.col-md-6.col-lg-3')]);
+}
+"""
+
+# Polls a predicate in the page, so waiting costs one WebDriver round trip instead of one per poll.
+WAIT_FOR_FUNCTION = """
+(predicate, timeoutMs, done) => {
+	const started = performance.now();
+	const check = () => {
+		const value = predicate();
+		if (value || performance.now() - started > timeoutMs) {
+			done(value || null);
+		} else {
+			setTimeout(check, 25);
+		}
+	};
+	check();
+}
+"""
+
+LATITUDE_INPUT_XPATH = "//input[@id='latitude-input']"
+LONGITUDE_INPUT_XPATH = "//input[@id='longitude-input']"
+UPDATE_BUTTON_XPATH = "//button[text()='Update location']"
+
+# Quiet time after the backend response before an update that left the page unchanged counts as rendered.
+UPDATE_SETTLE_MS = 100
+
+# Watches an Update location click made right after the call and resolves with its outcome and the click-to-done
+# time: 'rendered' once the table and summary show something new, 'alert' on a new alert. An update can render the
+# same table as before (both poles in the sweep, or a repeated location), so it is also complete, 'unchanged', once
+# the backend has answered and the page stayed the same for `settleMs` after the response; its time is taken at the
+# response. Shared by the scripted clicks below and the click timer of `tests/throttling.py`.
+UPDATE_WATCH_SCRIPT = """
+((timeoutMs, settleMs) => {
+	const isBackend = entry => entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest';
+	const rendered = () => {
+		const table = document.querySelector('div.overflow-x-auto table tbody');
+		const summary = document.querySelector('div.row.mb-3');
+		return (table ? table.innerText : '') + '\\n' + (summary ? summary.innerText : '');
+	};
+	const alerts = () => document.querySelectorAll("div.alert-danger[role='alert']").length;
+	const before = rendered();
+	const alertsBefore = alerts();
+	let respondedAt = null;
+	const observer = new PerformanceObserver(list => {
+		for (const entry of list.getEntries().filter(isBackend)) {
+			respondedAt = Math.max(respondedAt || 0, entry.responseEnd);
+		}
+	});
+	observer.observe({type: 'resource'});
+	const clicked = performance.now();
+
+	return new Promise(resolve => {
+		const finish = outcome => {
+			observer.disconnect();
+			resolve({outcome, renderMs: (outcome === 'unchanged' ? respondedAt : performance.now()) - clicked});
+		};
+		const check = () => {
+			if (alerts() > alertsBefore) {
+				finish('alert');
+			} else if (rendered() !== before) {
+				finish('rendered');
+			} else if (respondedAt !== null && performance.now() - respondedAt > settleMs) {
+				finish('unchanged');
+			} else if (performance.now() - clicked > timeoutMs) {
+				finish('timeout');
+			} else {
+				setTimeout(check, 5);
+			}
+		};
+		// Let the click reach the app's handler before the first look.
+		setTimeout(check, 0);
+	});
+})
+"""
+
+# Clicks Update location and resolves with the outcome of `UPDATE_WATCH_SCRIPT` ('unchanged' counts as rendered)
+# and the backend requests the update made.
+UPDATE_LOCATION_SCRIPT = """
+(async (timeoutMs, settleMs) => {
+	const isBackend = entry => entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest';
+	const button = [...document.querySelectorAll('button')].find(
+		button => button.textContent.trim() === 'Update location'
+	);
+	if (!button) {
+		return {error: 'no Update location button'};
+	}
+
+	performance.clearResourceTimings();
+	const watch = (%s)(timeoutMs, settleMs);
+	button.click();
+	const {outcome, renderMs} = await watch;
+
+	const requests = performance.getEntriesByType('resource').filter(isBackend);
+	const backend = requests.reduce((slowest, entry) => entry.duration > slowest.duration ? entry : slowest, {
+		duration: null, name: null,
+	});
+	return {
+		outcome: outcome === 'unchanged' ? 'rendered' : outcome,
+		renderMs,
+		backendMs: backend.duration,
+		backendUrl: backend.name,
+		requests: requests.length,
+	};
+})
+""" % UPDATE_WATCH_SCRIPT.strip()
+
+
+def update_location_script(timeout: int, settle_ms: int = UPDATE_SETTLE_MS) -> str:
+	"""Expression that clicks Update location in the page and resolves with its outcome and timings."""
+	return f"({UPDATE_LOCATION_SCRIPT.strip()})({timeout * 1000}, {settle_ms})"
+
+
+def wait_for_script(predicate: str) -> str:
+	return f"({WAIT_FOR_FUNCTION.strip()})({predicate.strip()}, arguments[0], arguments[arguments.length - 1]);"
+
+
+@traced('selector')
+@handle_exceptions
+def wait_for_app_ready(driver: WebDriver, timeout: int) -> None:
+	driver.set_script_timeout(timeout + 5)
+	if not driver.execute_async_script(wait_for_script(APP_READY_PREDICATE), timeout * 1000):
+		raise TimeoutException(f"App was not ready after {timeout}s")
 
 
+@traced('selector')
 @handle_exceptions
 def find_user_location(driver: WebDriver, timeout: int) -> list[WebElement]:
-	div_element = WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//div[h3[contains(text(), 'Your location')]]"
-			)
-		)
-	)
-	tbody_element = div_element.find_element(By.TAG_NAME, 'tbody')
-
-	return tbody_element.find_elements(By.TAG_NAME, 'th')
+	return locators.find(driver, 'user_location', timeout)
 
 
+@traced('selector')
 @handle_exceptions
 def find_selected_location(driver: WebDriver, timeout: int) -> list[WebElement]:
-	div_element = WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//div[h3[contains(text(), 'Selected location')]]"
-			)
-		)
-	)
-
-	return [
-		div_element.find_element(By.XPATH, ".//input[@id='latitude-input']"),
-		div_element.find_element(By.XPATH, ".//input[@id='longitude-input']")
-	]
+	return locators.find(driver, 'selected_location', timeout)
 
 
+@traced('selector')
 @handle_exceptions
 def find_update_button(driver: WebDriver, timeout: int) -> WebElement:
-	return WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//button[text()='Update location']"
-			)
-		)
-	)
+	return locators.find(driver, 'update_button', timeout)
 
 
+@traced('selector')
 @handle_exceptions
 def find_error_messages(driver: WebDriver, timeout: int) -> list[WebElement]:
-	WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//div[contains(@class, 'alert-danger') and @role='alert']"
-			)
-		)
-	)
-
-	return driver.find_elements(By.XPATH, "//div[contains(@class, 'alert-danger') and @role='alert']")
+	return locators.find(driver, 'error_alerts', timeout)
 
 
+@traced('selector')
 @handle_exceptions
 def find_week_forecast_table(driver: WebDriver, timeout: int) -> WebElement:
-	div_element = WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//div[contains(@class, 'overflow-x-auto')]"
-			)
-		)
-	)
-
-	return div_element.find_element(By.TAG_NAME, 'table')
+	return locators.find(driver, 'forecast_table', timeout)
 
 
+@traced('selector')
 @handle_exceptions
 def find_week_forecast_table_header_th(driver: WebDriver, timeout: int) -> list[WebElement]:
 	table_element = find_week_forecast_table(driver, timeout)
@@ -89,6 +194,7 @@ def find_week_forecast_table_header_th(driver: WebDriver, timeout: int) -> list[
 	return tr_element.find_elements(By.CLASS_NAME, 'align-middle')
 
 
+@traced('selector')
 @handle_exceptions
 def find_week_forecast_table_body_tr(driver: WebDriver, timeout: int) -> list[WebElement]:
 	table_element = find_week_forecast_table(driver, timeout)
@@ -97,13 +203,7 @@ def find_week_forecast_table_body_tr(driver: WebDriver, timeout: int) -> list[We
 	return tbody_element.find_elements(By.TAG_NAME, 'tr')
 
 
+@traced('selector')
 @handle_exceptions
 def find_week_summary_div(driver: WebDriver, timeout: int) -> WebElement:
-	return WebDriverWait(driver, timeout).until(
-		expected_conditions.presence_of_element_located(
-			(
-				By.XPATH,
-				"//div[contains(@class, 'row mb-3') and .//div[contains(@class, 'col-12 col-md-6 col-lg-3')]]"
-			)
-		)
-	)
+	return locators.find(driver, 'summary', timeout)
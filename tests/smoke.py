@@ -0,0 +1,171 @@
+"""Time-budgeted smoke selection.
+
+Every run records per-test durations and failures in pytest's cache. A duration is the setup and call time of a
+test that ran (passed or failed); skipped tests are not recorded, and the setup of session-scoped fixtures is left
+out because only the first test that uses them pays it. With `--time-budget SECONDS` the collected tests are cut
+down to a set that covers every feature area (the `feature` marker) within the budget, recently failing tests
+first, and the terminal summary lists what was left out.
+"""
+
+import statistics
+import time
+
+import pytest
+from _pytest.config import Config
+from _pytest.fixtures import FixtureDef, SubRequest
+from _pytest.reports import TestReport
+from _pytest.terminal import TerminalReporter
+
+CACHE_KEY = 'weather_e2e/durations'
+
+FEATURE_AREAS = ('location_input', 'forecast_table', 'summary', 'geolocation')
+
+RECENT_FAILURE_SECONDS = 7 * 24 * 3600
+
+DEFAULT_DURATION_SECONDS = 10.0
+
+# Weight of the newest run in the recorded duration, so one slow outlier does not dominate.
+_SMOOTHING = 0.5
+
+
+def feature_areas(item: pytest.Item) -> set[str]:
+	return {area for marker in item.iter_markers('feature') for area in marker.args}
+
+
+class TimeBudget:
+	def __init__(self, config: Config, budget: float | None, record: bool = True) -> None:
+		self.cache = config.cache
+		self.budget = budget
+		self.record = record
+		self.history: dict[str, dict] = self.cache.get(CACHE_KEY, {})
+		self.run_durations: dict[str, float] = {}
+		self.run_failures: set[str] = set()
+		self.setup_durations: dict[str, float] = {}
+		self.shared_setup_seconds = 0.0
+		self._shared_depth = 0
+		self.selection: list[pytest.Item] = []
+		self.left_out: list[pytest.Item] = []
+		self.uncovered: set[str] = set()
+		self.costs: dict[str, float] = {}
+
+	def _cost(self, item: pytest.Item) -> float:
+		known = [entry['duration'] for entry in self.history.values() if 'duration' in entry]
+		default = statistics.median(known) if known else DEFAULT_DURATION_SECONDS
+		return self.history.get(item.nodeid, {}).get('duration', default)
+
+	def _failed_at(self, item: pytest.Item) -> float:
+		failed_at = self.history.get(item.nodeid, {}).get('failed_at', 0)
+		return failed_at if time.time() - failed_at < RECENT_FAILURE_SECONDS else 0
+
+	def select(self, items: list[pytest.Item]) -> list[pytest.Item]:
+		self.costs = {item.nodeid: self._cost(item) for item in items}
+		remaining_budget = self.budget
+		selected: list[pytest.Item] = []
+		candidates = sorted(items, key=lambda item: item.nodeid)
+		uncovered = {area for item in items for area in feature_areas(item)}
+
+		def fits(item: pytest.Item) -> bool:
+			return self.costs[item.nodeid] <= remaining_budget
+
+		# Cover every feature area first: most new areas per second, recently failing tests winning ties.
+		while uncovered:
+			options = [item for item in candidates if feature_areas(item) & uncovered and fits(item)]
+			if not options:
+				break
+
+			best = max(
+				options,
+				key=lambda item: (
+					len(feature_areas(item) & uncovered) / max(self.costs[item.nodeid], 0.001),
+					self._failed_at(item),
+				),
+			)
+			selected.append(best)
+			candidates.remove(best)
+			remaining_budget -= self.costs[best.nodeid]
+			uncovered -= feature_areas(best)
+
+		# Fill what is left of the budget: recently failing first, then cheapest.
+		for item in sorted(candidates, key=lambda item: (-self._failed_at(item), self.costs[item.nodeid])):
+			if fits(item):
+				selected.append(item)
+				remaining_budget -= self.costs[item.nodeid]
+
+		self.uncovered = uncovered
+		return selected
+
+	@pytest.hookimpl(trylast=True)
+	def pytest_collection_modifyitems(self, config: Config, items: list[pytest.Item]) -> None:
+		if self.budget is None:
+			return
+
+		# Tests skipped anyway (for example by the result cache) cost nothing, but they cover nothing either.
+		skipped = [item for item in items if item.get_closest_marker('skip')]
+		chosen = {item.nodeid for item in self.select([item for item in items if item not in skipped])}
+		chosen |= {item.nodeid for item in skipped}
+		self.selection = [item for item in items if item.nodeid in chosen]
+		self.left_out = [item for item in items if item.nodeid not in chosen]
+
+		if self.left_out:
+			config.hook.pytest_deselected(items=self.left_out)
+		items[:] = self.selection
+
+	@pytest.hookimpl(wrapper=True)
+	def pytest_fixture_setup(self, fixturedef: FixtureDef, request: SubRequest) -> object:
+		if fixturedef.scope == 'function' or self._shared_depth:
+			return (yield)
+
+		self._shared_depth += 1
+		started = time.perf_counter()
+		try:
+			return (yield)
+		finally:
+			self._shared_depth -= 1
+			self.shared_setup_seconds += time.perf_counter() - started
+
+	def pytest_runtest_logreport(self, report: TestReport) -> None:
+		if report.failed:
+			self.run_failures.add(report.nodeid)
+
+		if report.when == 'setup':
+			shared, self.shared_setup_seconds = self.shared_setup_seconds, 0.0
+			if report.passed:
+				self.setup_durations[report.nodeid] = max(report.duration - shared, 0.0)
+			elif report.failed:
+				self.run_durations[report.nodeid] = max(report.duration - shared, 0.0)
+		elif report.when == 'call':
+			setup = self.setup_durations.pop(report.nodeid, 0.0)
+			if not report.skipped:
+				self.run_durations[report.nodeid] = setup + report.duration
+
+	def pytest_sessionfinish(self) -> None:
+		if not self.record:
+			return
+
+		now = time.time()
+		for nodeid, duration in self.run_durations.items():
+			entry = self.history.setdefault(nodeid, {})
+			previous = entry.get('duration')
+			entry['duration'] = duration if previous is None else _SMOOTHING * duration + (1 - _SMOOTHING) * previous
+			if nodeid in self.run_failures:
+				entry['failed_at'] = now
+
+		self.cache.set(CACHE_KEY, self.history)
+
+	def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+		if self.budget is None or not (self.selection or self.left_out):
+			return
+
+		estimate = sum(self.costs.get(item.nodeid, 0.0) for item in self.selection)
+		terminalreporter.section('time budget')
+		terminalreporter.write_line(
+			f"selected {len(self.selection)} of {len(self.selection) + len(self.left_out)} tests, "
+			f"estimated {estimate:.1f}s of {self.budget:.1f}s"
+		)
+		if self.uncovered:
+			terminalreporter.write_line(
+				f"feature areas not covered within the budget: {', '.join(sorted(self.uncovered))}", red=True
+			)
+		for item in self.left_out:
+			areas = ', '.join(sorted(feature_areas(item))) or 'untagged'
+			terminalreporter.write_line(f"left out: {item.nodeid} (~{self.costs[item.nodeid]:.1f}s, {areas})")
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from tests.tracing import traced
+from tests.utils import handle_exceptions
+
+# Reads everything the read-only tests look at in one round trip. Mirrors the lookups in tests/selectors.py.
+SNAPSHOT_SCRIPT = """
+const displayed = element => {
+	const style = getComputedStyle(element);
+	return style.visibility !== 'hidden' && style.display !== 'none' && element.getClientRects().length > 0;
+};
+const text = element => ({text: element.innerText.trim(), displayed: displayed(element)});
+const icons = element => [...element.querySelectorAll('svg')].map(
+	svg => ({name: svg.getAttribute('data-icon'), displayed: displayed(svg)})
+);
+const panel = title => [...document.querySelectorAll('div')].find(
+	div => [...div.children].some(child => child.tagName === 'H3' && child.textContent.includes(title))
+);
+
+const userLocation = panel('Your location');
+const selectedLocation = panel('Selected location');
+const table = document.querySelector('div.overflow-x-auto table');
+const summary = [...document.querySelectorAll('div.row.mb-3')].find(
+	div => div.querySelector('div.col-12.col-md-6.col-lg-3')
+);
+
+return {
+	user_location: userLocation ? [...userLocation.querySelectorAll('tbody th')].map(text) : [],
+	selected_location: selectedLocation
+		? ['latitude-input', 'longitude-input']
+			.map(id => selectedLocation.querySelector(`input#${id}`))
+			.filter(Boolean)
+			.map(input => ({text: input.value, displayed: displayed(input)}))
+		: [],
+	table_headers: table ? [...table.querySelector('tr').querySelectorAll('.align-middle')].map(text) : [],
+	table_rows: table
+		? [...table.querySelectorAll('tbody tr')].map(row => {
+			const [header, ...cells] = row.querySelectorAll('th');
+			return {
+				header: header ? header.innerText.trim() : '',
+				cells: cells.map(cell => ({...text(cell), icons: icons(cell)})),
+			};
+		})
+		: [],
+	summary: summary
+		? [...summary.querySelectorAll('div.col-12.col-md-6.col-lg-3')].map(item => ({
+			...text(item),
+			spans: [...item.querySelectorAll('span')].map(span => {
+				const description = span.querySelector('div');
+				return {
+					...text(span),
+					icons: icons(span),
+					paragraphs: description ? [...description.querySelectorAll('p')].map(text) : [],
+				};
+			}),
+		}))
+		: [],
+};
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Icon:
+	name: str | None
+	displayed: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Text:
+	text: str
+	displayed: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Cell:
+	text: str
+	displayed: bool
+	icons: tuple[Icon, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Row:
+	header: str
+	cells: tuple[Cell, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+	text: str
+	displayed: bool
+	icons: tuple[Icon, ...]
+	paragraphs: tuple[Text, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SummaryItem:
+	text: str
+	displayed: bool
+	spans: tuple[Span, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PageSnapshot:
+	user_location: tuple[Text, ...]
+	selected_location: tuple[Text, ...]
+	table_headers: tuple[Text, ...]
+	table_rows: tuple[Row, ...]
+	summary: tuple[SummaryItem, ...]
+
+	@classmethod
+	def from_dict(cls, data: dict) -> 'PageSnapshot':
+		def icons(items: list[dict]) -> tuple[Icon, ...]:
+			return tuple(Icon(item['name'], item['displayed']) for item in items)
+
+		def texts(items: list[dict]) -> tuple[Text, ...]:
+			return tuple(Text(item['text'], item['displayed']) for item in items)
+
+		return cls(
+			user_location=texts(data['user_location']),
+			selected_location=texts(data['selected_location']),
+			table_headers=texts(data['table_headers']),
+			table_rows=tuple(
+				Row(
+					row['header'],
+					tuple(Cell(cell['text'], cell['displayed'], icons(cell['icons'])) for cell in row['cells']),
+				)
+				for row in data['table_rows']
+			),
+			summary=tuple(
+				SummaryItem(
+					item['text'],
+					item['displayed'],
+					tuple(
+						Span(span['text'], span['displayed'], icons(span['icons']), texts(span['paragraphs']))
+						for span in item['spans']
+					),
+				)
+				for item in data['summary']
+			),
+		)
+
+
+@traced('selector')
+@handle_exceptions
+def capture_snapshot(driver: WebDriver) -> PageSnapshot:
+	return PageSnapshot.from_dict(driver.execute_script(SNAPSHOT_SCRIPT))
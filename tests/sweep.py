@@ -0,0 +1,225 @@
+"""Sweep a latitude/longitude grid in one warm browser tab and profile every region.
+
+The page at `URL` is loaded once; every grid point is then entered through the DevTools fast path of
+`tests/async_driver.py` (focus, insert text, click) and timed inside the page: the backend request from the
+resource timings, and click-to-render until the forecast table and summary change, the backend response has been
+rendered without changing them, or an alert appears. The rendered page is checked with the rules of
+`tests/validation.py`. Points are grouped into regions:
+
+    python -m tests.sweep --lat-step 15 --lon-step 30 --region-size 30 --output sweep.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+
+import trio
+from dotenv import load_dotenv
+from selenium.common import JavascriptException, TimeoutException, WebDriverException
+
+from tests import async_driver, launch
+from tests.devtools import browser_websocket_url
+from tests.selectors import (
+	APP_READY_PREDICATE,
+	LATITUDE_INPUT_XPATH,
+	LONGITUDE_INPUT_XPATH,
+	update_location_script,
+)
+from tests.snapshot import SNAPSHOT_SCRIPT, PageSnapshot
+from tests.validation import RULES, Record, validate
+
+load_dotenv()
+url = os.getenv("URL")
+
+# The selected location changes on every point, so the default-location rule does not apply.
+SWEEP_RULES = tuple(name for name in RULES if name != 'default_location')
+
+REGION_FIELDS = (
+	'lat_from', 'lat_to', 'lon_from', 'lon_to', 'points', 'render_ms_median', 'render_ms_max', 'backend_ms_median',
+	'backend_ms_max', 'alerts', 'timeouts', 'invalid',
+)
+
+
+@dataclass
+class PointResult:
+	latitude: float
+	longitude: float
+	outcome: str
+	render_ms: float | None = None
+	backend_ms: float | None = None
+	requests: int = 0
+	violations: list[str] = field(default_factory=list)
+
+
+def grid(lat_min: float, lat_max: float, lat_step: float, lon_min: float, lon_max: float, lon_step: float) -> list:
+	def steps(start: float, stop: float, step: float) -> list[float]:
+		count = int(round((stop - start) / step))
+		return [round(start + index * step, 4) for index in range(count + 1)]
+
+	longitudes = steps(lon_min, lon_max, lon_step)
+	if len(longitudes) > 1 and longitudes[-1] - longitudes[0] >= 360:
+		# -180 and 180 are the same meridian.
+		longitudes.pop()
+
+	return [(latitude, longitude) for latitude in steps(lat_min, lat_max, lat_step) for longitude in longitudes]
+
+
+async def measure_point(tab: async_driver.Tab, latitude: float, longitude: float, timeout: int) -> PointResult:
+	try:
+		await tab.fill(LATITUDE_INPUT_XPATH, str(latitude))
+		await tab.fill(LONGITUDE_INPUT_XPATH, str(longitude))
+		timing = await tab.evaluate(update_location_script(timeout), timeout + 5)
+	except trio.TooSlowError:
+		return PointResult(latitude, longitude, 'timeout')
+	except (JavascriptException, WebDriverException) as e:
+		return PointResult(latitude, longitude, 'error', violations=[str(e)])
+
+	if 'error' in timing:
+		return PointResult(latitude, longitude, 'error', violations=[timing['error']])
+
+	result = PointResult(
+		latitude, longitude, timing['outcome'], timing['renderMs'], timing['backendMs'], timing['requests']
+	)
+	if result.outcome == 'rendered':
+		try:
+			snapshot = PageSnapshot.from_dict(await tab.evaluate(f"(() => {{{SNAPSHOT_SCRIPT}}})()"))
+		except trio.TooSlowError:
+			result.violations = ['page snapshot timed out']
+			return result
+		result.violations = [
+			f"[{violation.rule}] {violation.message}"
+			for violation in validate(Record(snapshot, time.time()), SWEEP_RULES)
+		]
+
+	return result
+
+
+async def sweep(websocket_url: str, points: list[tuple[float, float]], timeout: int) -> list[PointResult]:
+	results = []
+	async with async_driver.connect(websocket_url) as browser, browser.tab() as tab:
+		await tab.goto(url, timeout)
+		await tab.wait_for(APP_READY_PREDICATE, timeout)
+
+		for index, (latitude, longitude) in enumerate(points, start=1):
+			result = await measure_point(tab, latitude, longitude, timeout)
+			results.append(result)
+			render = f"{result.render_ms:7.0f} ms" if result.render_ms is not None else '      - ms'
+			print(
+				f"[{index}/{len(points)}] {latitude:9.4f} {longitude:9.4f}  {result.outcome:<8} {render}"
+				f"  {len(result.violations)} violation(s)"
+			)
+
+	return results
+
+
+def _region(value: float, origin: float, end: float, size: float) -> float:
+	# The far edge (the pole, the date line at +180) belongs to the last region rather than one of its own.
+	return min(origin + (value - origin) // size * size, end - size)
+
+
+def summarize(results: list[PointResult], region_size: float) -> list[dict]:
+	regions: dict[tuple[float, float], list[PointResult]] = {}
+	for result in results:
+		key = (
+			_region(result.latitude, -90, 90, region_size), _region(result.longitude, -180, 180, region_size)
+		)
+		regions.setdefault(key, []).append(result)
+
+	def stats(values: list[float]) -> tuple[float | None, float | None]:
+		return (round(statistics.median(values), 1), round(max(values), 1)) if values else (None, None)
+
+	summary = []
+	for (latitude, longitude), members in sorted(regions.items()):
+		render_median, render_max = stats([member.render_ms for member in members if member.render_ms is not None])
+		backend_median, backend_max = stats(
+			[member.backend_ms for member in members if member.backend_ms is not None]
+		)
+		summary.append({
+			'lat_from': latitude,
+			'lat_to': latitude + region_size,
+			'lon_from': longitude,
+			'lon_to': longitude + region_size,
+			'points': len(members),
+			'render_ms_median': render_median,
+			'render_ms_max': render_max,
+			'backend_ms_median': backend_median,
+			'backend_ms_max': backend_max,
+			'alerts': sum(member.outcome == 'alert' for member in members),
+			'timeouts': sum(member.outcome in ('timeout', 'error') for member in members),
+			'invalid': sum(bool(member.violations) for member in members),
+		})
+
+	return summary
+
+
+def heatmap(summary: list[dict]) -> str:
+	"""Median click-to-render per region, north at the top; `!` marks regions with alerts, failures or timeouts."""
+	latitudes = sorted({region['lat_from'] for region in summary}, reverse=True)
+	longitudes = sorted({region['lon_from'] for region in summary})
+	cells = {(region['lat_from'], region['lon_from']): region for region in summary}
+
+	lines = ['lat \\ lon ' + ''.join(f"{longitude:>9.0f}" for longitude in longitudes)]
+	for latitude in latitudes:
+		row = []
+		for longitude in longitudes:
+			region = cells.get((latitude, longitude))
+			if region is None or region['render_ms_median'] is None:
+				row.append(f"{'-':>9}")
+				continue
+			broken = region['alerts'] or region['timeouts'] or region['invalid']
+			row.append(f"{region['render_ms_median']:>8.0f}{'!' if broken else ' '}")
+		lines.append(f"{latitude:>9.0f} " + ''.join(row))
+
+	return '\n'.join(lines)
+
+
+def write(path: str, results: list[PointResult], summary: list[dict]) -> None:
+	if path.endswith('.csv'):
+		with open(path, 'w', newline='') as file:
+			writer = csv.DictWriter(file, fieldnames=REGION_FIELDS)
+			writer.writeheader()
+			writer.writerows(summary)
+	else:
+		with open(path, 'w') as file:
+			json.dump({'regions': summary, 'points': [asdict(result) for result in results]}, file, indent='\t')
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--lat-min', type=float, default=-90)
+	parser.add_argument('--lat-max', type=float, default=90)
+	parser.add_argument('--lat-step', type=float, default=30)
+	parser.add_argument('--lon-min', type=float, default=-180)
+	parser.add_argument('--lon-max', type=float, default=180)
+	parser.add_argument('--lon-step', type=float, default=60)
+	parser.add_argument('--region-size', type=float, default=30, help='Region edge in degrees for the summary.')
+	parser.add_argument('--timeout', type=int, default=15, help='Seconds to wait for each update to render.')
+	parser.add_argument('--output', default='sweep.json', help='Summary file: .csv (regions) or .json (all).')
+	parser.add_argument('--headed', action='store_true', help='Launch a visible browser window.')
+	args = parser.parse_args()
+
+	points = grid(args.lat_min, args.lat_max, args.lat_step, args.lon_min, args.lon_max, args.lon_step)
+	if not points:
+		raise SystemExit('The grid has no points; check the --lat-*/--lon-* ranges.')
+
+	driver = launch.new_session(headless=not args.headed)
+	try:
+		results = trio.run(sweep, browser_websocket_url(driver), points, args.timeout)
+	except (TimeoutException, trio.TooSlowError) as e:
+		raise SystemExit(f"The app at {url} did not become ready: {e}")
+	finally:
+		driver.quit()
+		launch.shutdown()
+
+	summary = summarize(results, args.region_size)
+	print(heatmap(summary))
+	write(args.output, results, summary)
+	print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+	main()
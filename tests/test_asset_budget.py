@@ -0,0 +1,27 @@
+import os
+
+import pytest
+import trio
+from _pytest.fixtures import FixtureRequest
+
+from tests import budget
+
+
+def test_first_load_within_asset_budget(
+		request: FixtureRequest, devtools_url: str, app_url: str, timeout_value: int
+) -> None:
+	path = request.config.getoption('--asset-budget') or budget.BUDGET_FILE
+	if not os.path.exists(path):
+		pytest.skip(f"No asset budget at {path}; measure one with python -m tests.budget against the deployed build")
+
+	limits = budget.load(path)
+	resources = trio.run(budget.load_page_resources, devtools_url, app_url, timeout_value)
+	assert resources, f"No responses recorded while loading {app_url}"
+
+	# `-p no:cacheprovider` leaves nothing to diff against or record into.
+	cache = getattr(request.config, 'cache', None)
+	violations = budget.check(resources, limits)
+	assert not violations, budget.report(violations, resources, cache.get(budget.CACHE_KEY, None) if cache else None)
+
+	if cache:
+		cache.set(budget.CACHE_KEY, budget.remember(resources, app_url))
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tests import daemon
+
+
+class FakeSession:
+	def __init__(self, session_id: str) -> None:
+		self.session_id = session_id
+		self.caps = {}
+		self.reset = False
+
+	@property
+	def window_handles(self) -> list[str]:
+		return ['home']
+
+	@property
+	def switch_to(self) -> SimpleNamespace:
+		return SimpleNamespace(window=lambda handle: None)
+
+	def delete_all_cookies(self) -> None:
+		self.reset = True
+
+	def execute_script(self, script: str) -> None:
+		pass
+
+	def get(self, url: str) -> None:
+		pass
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+	now = [1000.0]
+	monkeypatch.setattr(daemon.time, 'monotonic', lambda: now[0])
+	monkeypatch.setattr(daemon.launch, 'shared_service', lambda: SimpleNamespace(service_url='http://127.0.0.1:9515'))
+	return now
+
+
+def test_renewed_lease_outlives_the_ttl(clock: list[float]) -> None:
+	pool = daemon.Pool(1)
+	held, other = FakeSession('held'), FakeSession('other')
+	pool.idle += [other, held]
+
+	assert pool.lease()['session_id'] == 'held'
+	for _ in range(3):
+		clock[0] += daemon.LEASE_TTL_SECONDS * 0.75
+		assert pool.renew('held')
+
+	# Leasing runs the reclaim of expired leases.
+	assert pool.lease()['session_id'] == 'other'
+	assert 'held' in pool.leased
+	assert not held.reset
+
+
+def test_lease_without_renewal_is_reclaimed(clock: list[float]) -> None:
+	pool = daemon.Pool(1)
+	pool.idle.append(FakeSession('held'))
+
+	pool.lease()
+	clock[0] += daemon.LEASE_TTL_SECONDS + 1
+	assert pool.lease() is None
+
+	assert 'held' not in pool.leased
+	assert not pool.renew('held')
+
+
+def test_failed_renewal_loses_the_lease(clock: list[float], monkeypatch: pytest.MonkeyPatch) -> None:
+	answers = []
+	monkeypatch.setattr(daemon, '_posted', lambda path: answers.pop(0))
+	session = SimpleNamespace(session_id='held', renewed_at=clock[0])
+
+	# Inside the renew interval nothing is asked.
+	assert daemon.LeasedSession.renew(session)
+
+	clock[0] += daemon.RENEW_INTERVAL_SECONDS
+	answers.append(True)
+	assert daemon.LeasedSession.renew(session)
+	assert session.renewed_at == clock[0]
+
+	clock[0] += daemon.RENEW_INTERVAL_SECONDS
+	answers.append(False)
+	assert not daemon.LeasedSession.renew(session)
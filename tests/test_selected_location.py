@@ -1,84 +1,80 @@
 import random
 
 import pytest
+import trio
 from _pytest.fixtures import FixtureRequest
-from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.wait import WebDriverWait
 
-from tests.selectors import find_error_messages, find_selected_location, find_update_button, find_user_location
+from tests import async_driver
+from tests.browser import GEOLOCATION_ALLOW, GEOLOCATION_BLOCK
+from tests.pages import WeatherPage
+from tests.selectors import APP_READY_PREDICATE, LATITUDE_INPUT_XPATH, LONGITUDE_INPUT_XPATH, UPDATE_BUTTON_XPATH
+from tests.snapshot import PageSnapshot
 from tests.utils import create_random_invalid_float, create_random_non_float
-
-
+from tests.validation import assert_valid
+
+pytestmark = pytest.mark.feature('location_input')
+
+ERROR_MESSAGES_PREDICATE = """
+() => {
+	const alerts = [...document.querySelectorAll("div.alert-danger[role='alert']")];
+	return alerts.length > 0 && alerts.map(alert => ({
+		text: alert.innerText,
+		displayed: alert.getClientRects().length > 0 && getComputedStyle(alert).visibility !== 'hidden',
+	}));
+}
+"""
+
+INVALID_INPUT_SCENARIOS = {
+	'invalid_float_latitude': lambda: (create_random_invalid_float(latitude=True), None),
+	'invalid_float_longitude': lambda: (None, create_random_invalid_float(longitude=True)),
+	'invalid_float_inputs': lambda: (
+		create_random_invalid_float(latitude=True), create_random_invalid_float(longitude=True)
+	),
+	'invalid_no_float_latitude': lambda: (create_random_non_float(10), None),
+	'invalid_no_float_longitude': lambda: (None, create_random_non_float(10)),
+	'invalid_no_float_inputs': lambda: (create_random_non_float(10), create_random_non_float(10)),
+}
+
+
+@pytest.mark.feature('geolocation')
 @pytest.mark.parametrize(
-	"driver_fixture, expected_input_value",
+	"snapshot_fixture, permission",
 	[
-		("driver_with_location_permission", "!= 0"),
-		("driver_without_location_permission", "== 0")
+		("snapshot_with_location_permission", "allow"),
+		("snapshot_without_location_permission", "block")
 	]
 )
-def test_default_selected_location(
-		request: FixtureRequest, driver_fixture: str, expected_input_value: str, timeout_value: int
-) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	input_elements = find_selected_location(driver, timeout_value)
-
-	assert input_elements, "No <input> elements found in <div>"
-	assert len(input_elements) == 2, f'Expected 2 <input> elements, found {len(input_elements)}'
-
-	for input_element in input_elements:
-		input_value = input_element.get_attribute("value")
+def test_default_selected_location(request: FixtureRequest, snapshot_fixture: str, permission: str) -> None:
+	snapshot: PageSnapshot = request.getfixturevalue(snapshot_fixture)
 
-		assert input_element.is_displayed(), f"Element <input> is not visible: {input_value}"
-
-		if expected_input_value == '!= 0':
-			assert input_value != '0', f"Unexpected value in <input>: {input_value}"
-		elif expected_input_value == '== 0':
-			assert input_value == '0', f"Unexpected value in <input>: {input_value}"
-
-		assert isinstance(float(input_value), float), f"<input> value is not a float: {input_value}"
-
-	selected_latitude, selected_longitude = [
-		float(input_element.get_attribute("value")) for input_element in input_elements
-	]
-	user_latitude, user_longitude = [float(th.text) for th in find_user_location(driver, timeout_value)]
-
-	assert user_latitude == selected_latitude, f"Latitude mismatch: {user_latitude} != {selected_latitude}"
-	assert user_longitude == selected_longitude, f"Longitude mismatch: {user_longitude} != {selected_longitude}"
+	assert_valid(snapshot, 'default_location', permission=permission)
 
 
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_change_latitude_in_selected_location(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(
-		driver, timeout_value
-	)
+def test_change_latitude_in_selected_location(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
-	start_latitude_value = selected_latitude_input.get_attribute("value")
-	start_longitude_value = selected_longitude_input.get_attribute("value")
+	start_latitude_value, start_longitude_value = weather_page.location_values()
 
 	random_latitude_value = str(round(random.uniform(-90, 90), 4))
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
+	weather_page.enter_location(latitude=random_latitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(
-		lambda d: selected_latitude_input.get_attribute("value") == random_latitude_value
+	WebDriverWait(weather_page.driver, timeout_value).until(
+		lambda d: weather_page.location_values()[0] == random_latitude_value
 	)
 
-	actual_latitude_value = selected_latitude_input.get_attribute("value")
-	actual_longitude_value = selected_longitude_input.get_attribute("value")
+	actual_latitude_value, actual_longitude_value = weather_page.location_values()
 
 	assert actual_latitude_value != start_latitude_value, (
 		f"Latitude did not change. Start: {start_latitude_value}, Actual: {actual_latitude_value}"
@@ -96,34 +92,26 @@ def test_change_latitude_in_selected_location(request: FixtureRequest, driver_fi
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_change_longitude_in_selected_location(
-		request: FixtureRequest, driver_fixture: str, timeout_value: int
-) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+def test_change_longitude_in_selected_location(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
-	start_latitude_value = selected_latitude_input.get_attribute("value")
-	start_longitude_value = selected_longitude_input.get_attribute("value")
+	start_latitude_value, start_longitude_value = weather_page.location_values()
 
 	random_longitude_value = str(round(random.uniform(-180, 180), 4))
 
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(longitude=random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(
-		lambda d: selected_longitude_input.get_attribute("value") == random_longitude_value
+	WebDriverWait(weather_page.driver, timeout_value).until(
+		lambda d: weather_page.location_values()[1] == random_longitude_value
 	)
 
-	actual_latitude_value = selected_latitude_input.get_attribute("value")
-	actual_longitude_value = selected_longitude_input.get_attribute("value")
+	actual_latitude_value, actual_longitude_value = weather_page.location_values()
 
 	assert actual_longitude_value != start_longitude_value, (
 		f"Longitude did not change. Start: {start_longitude_value}, Actual: {actual_longitude_value}"
@@ -141,39 +129,30 @@ def test_change_longitude_in_selected_location(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_change_whole_selected_location(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
+def test_change_whole_selected_location(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
-
-	start_latitude_value = selected_latitude_input.get_attribute("value")
-	start_longitude_value = selected_longitude_input.get_attribute("value")
+	start_latitude_value, start_longitude_value = weather_page.location_values()
 
 	random_latitude_value = str(round(random.uniform(-90, 90), 4))
 	random_longitude_value = str(round(random.uniform(-180, 180), 4))
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
-
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(random_latitude_value, random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(
-		lambda d: selected_latitude_input.get_attribute("value") == random_latitude_value
+	WebDriverWait(weather_page.driver, timeout_value).until(
+		lambda d: weather_page.location_values()[0] == random_latitude_value
 	)
-	WebDriverWait(driver, timeout_value).until(
-		lambda d: selected_longitude_input.get_attribute("value") == random_longitude_value
+	WebDriverWait(weather_page.driver, timeout_value).until(
+		lambda d: weather_page.location_values()[1] == random_longitude_value
 	)
 
-	actual_latitude_value = selected_latitude_input.get_attribute("value")
-	actual_longitude_value = selected_longitude_input.get_attribute("value")
+	actual_latitude_value, actual_longitude_value = weather_page.location_values()
 
 	assert actual_latitude_value != start_latitude_value, (
 		f"Latitude did not change. Start: {start_latitude_value}, Actual: {actual_latitude_value}"
@@ -193,23 +172,18 @@ def test_change_whole_selected_location(request: FixtureRequest, driver_fixture:
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_change_nothing_in_selected_location(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
+def test_change_nothing_in_selected_location(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	start_latitude_value, start_longitude_value = weather_page.location_values()
 
-	start_latitude_value = selected_latitude_input.get_attribute("value")
-	start_longitude_value = selected_longitude_input.get_attribute("value")
+	weather_page.update_location()
 
-	update_location_button.click()
-
-	actual_latitude_value = selected_latitude_input.get_attribute("value")
-	actual_longitude_value = selected_longitude_input.get_attribute("value")
+	actual_latitude_value, actual_longitude_value = weather_page.location_values()
 
 	assert actual_latitude_value == start_latitude_value, (
 		f"Latitude changed. Start: {start_latitude_value}, Actual: {actual_latitude_value}"
@@ -220,195 +194,208 @@ def test_change_nothing_in_selected_location(request: FixtureRequest, driver_fix
 	)
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_float_latitude_input(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+def test_invalid_float_latitude_input(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_latitude_value = create_random_invalid_float(latitude=True)
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
+	weather_page.enter_location(latitude=random_latitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_float_longitude_input(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
+def test_invalid_float_longitude_input(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
-
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_longitude_value = create_random_invalid_float(longitude=True)
 
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(longitude=random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_float_inputs(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+def test_invalid_float_inputs(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_latitude_value = create_random_invalid_float(latitude=True)
 	random_longitude_value = create_random_invalid_float(longitude=True)
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
-
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(random_latitude_value, random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_no_float_latitude_input(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
+def test_invalid_no_float_latitude_input(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
-
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_latitude_value = create_random_non_float(10)
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
+	weather_page.enter_location(latitude=random_latitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_no_float_longitude_input(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
-
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
+def test_invalid_no_float_longitude_input(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_longitude_value = create_random_non_float(10)
 
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(longitude=random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
 
 
+@pytest.mark.variant('sequential')
 @pytest.mark.parametrize(
 	"driver_fixture",
 	["driver_with_location_permission", "driver_without_location_permission"]
 )
-def test_invalid_no_float_inputs(request: FixtureRequest, driver_fixture: str, timeout_value: int) -> None:
-	driver: WebDriver = request.getfixturevalue(driver_fixture)
+def test_invalid_no_float_inputs(weather_page: WeatherPage, timeout_value: int) -> None:
+	latitude_displayed, longitude_displayed = weather_page.location_inputs_displayed()
 
-	update_location_button = find_update_button(driver, timeout_value)
-	selected_latitude_input, selected_longitude_input = find_selected_location(driver, timeout_value)
-
-	assert update_location_button.is_displayed(), "Update button is not visible"
-	assert selected_latitude_input.is_displayed(), "Latitude input is not visible"
-	assert selected_longitude_input.is_displayed(), "Longitude input is not visible"
+	assert weather_page.update_button_displayed(), "Update button is not visible"
+	assert latitude_displayed, "Latitude input is not visible"
+	assert longitude_displayed, "Longitude input is not visible"
 
 	random_latitude_value = create_random_non_float(10)
 	random_longitude_value = create_random_non_float(10)
 
-	selected_latitude_input.clear()
-	selected_latitude_input.send_keys(random_latitude_value)
-
-	selected_longitude_input.clear()
-	selected_longitude_input.send_keys(random_longitude_value)
+	weather_page.enter_location(random_latitude_value, random_longitude_value)
 
-	update_location_button.click()
+	weather_page.update_location()
 
-	WebDriverWait(driver, timeout_value).until(lambda d: len(find_error_messages(d, timeout_value)) > 0)
+	WebDriverWait(weather_page.driver, timeout_value).until(lambda d: len(weather_page.error_messages()) > 0)
 
-	div_error_messages = find_error_messages(driver, timeout_value)
+	div_error_messages = weather_page.error_messages()
 	assert len(div_error_messages) > 0, "No error messages found"
 
-	for idx, error_msg in enumerate(div_error_messages):
-		assert error_msg.is_displayed(), f"Error message {idx + 1} is not visible"
-		assert 'Something went wrong' in error_msg.text, f"Unexpected error message: {error_msg.text}"
+	for idx, (error_text, error_displayed) in enumerate(div_error_messages):
+		assert error_displayed, f"Error message {idx + 1} is not visible"
+		assert 'Something went wrong' in error_text, f"Unexpected error message: {error_text}"
+
+
+@pytest.mark.variant('concurrent')
+def test_invalid_inputs_concurrently(devtools_url: str, app_url: str, timeout_value: int) -> None:
+	failures = []
+
+	async def run_scenario(browser: async_driver.AsyncBrowser, name: str, geolocation: int) -> None:
+		latitude_value, longitude_value = INVALID_INPUT_SCENARIOS[name]()
+
+		async with browser.tab(geolocation) as tab:
+			try:
+				await tab.goto(app_url, timeout_value)
+				await tab.wait_for(APP_READY_PREDICATE, timeout_value)
+
+				if latitude_value is not None:
+					await tab.fill(LATITUDE_INPUT_XPATH, str(latitude_value))
+				if longitude_value is not None:
+					await tab.fill(LONGITUDE_INPUT_XPATH, str(longitude_value))
+				await tab.click(UPDATE_BUTTON_XPATH)
+
+				div_error_messages = await tab.wait_for(ERROR_MESSAGES_PREDICATE, timeout_value)
+				for idx, error_msg in enumerate(div_error_messages):
+					assert error_msg['displayed'], f"Error message {idx + 1} is not visible"
+					assert 'Something went wrong' in error_msg['text'], f"Unexpected error message: {error_msg['text']}"
+
+			except Exception as e:
+				failures.append(f"{name} (geolocation={geolocation}, {latitude_value!r}, {longitude_value!r}): {e!r}")
+
+	async def run_all() -> None:
+		async with async_driver.connect(devtools_url) as browser, trio.open_nursery() as nursery:
+			for name in INVALID_INPUT_SCENARIOS:
+				for geolocation in (GEOLOCATION_ALLOW, GEOLOCATION_BLOCK):
+					nursery.start_soon(run_scenario, browser, name, geolocation)
+
+	trio.run(run_all)
+
+	assert not failures, "Failed scenarios:\n" + "\n".join(failures)
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from tests import visual
+
+pytestmark = pytest.mark.feature('forecast_table', 'summary')
+
+
+def test_regions_match_visual_baselines(request: FixtureRequest, driver_without_location_permission: WebDriver) -> None:
+	update = request.config.getoption('--update-visual-baselines')
+	artifacts_dir = request.config.getoption('--failure-artifacts')
+	problems, missing = [], []
+
+	for region in visual.REGIONS:
+		image = visual.capture(driver_without_location_permission, region)
+		if update:
+			visual.save_baseline(region, image)
+			continue
+
+		baseline = visual.load_baseline(region)
+		if baseline is None:
+			missing.append(region.name)
+			continue
+
+		region_problems, diff = visual.compare(region, image, baseline)
+		problems += region_problems
+		if diff is not None and artifacts_dir:
+			directory = os.path.join(os.path.abspath(artifacts_dir), 'visual')
+			os.makedirs(directory, exist_ok=True)
+			with open(os.path.join(directory, f'{region.name}.actual.png'), 'wb') as file:
+				file.write(visual.encode_png(image))
+			with open(os.path.join(directory, f'{region.name}.diff.png'), 'wb') as file:
+				file.write(visual.encode_png(diff))
+
+	if update:
+		pytest.skip(f"Wrote the visual baselines to {visual.BASELINE_DIR}")
+
+	assert not problems, "Visual differences from the baselines:\n" + "\n".join(problems)
+	if missing:
+		pytest.skip(f"No visual baseline for {', '.join(missing)} (pytest --update-visual-baselines)")
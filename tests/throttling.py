@@ -0,0 +1,116 @@
+"""Low-end device runs: CPU throttling for every page the fixtures open, with render timings per scenario.
+
+`--cpu-slowdown RATE` applies `Emulation.setCPUThrottlingRate` (RATE times slower) to each fixture page before it
+loads, and `timeout_value` scales with it, so the functional tests run unchanged on a slow CPU. A timer injected
+ahead of the app's scripts notes, in page time, when the app first became ready and how long every Update location
+click took, detected like the scripted clicks of `tests/selectors.py`: until the table and summary re-rendered, an
+alert appeared, or the backend answered and the page stayed unchanged for `UPDATE_SETTLE_MS` (an 'unchanged'
+outcome, timed at the response). The timings are read once per test at
+teardown, attached as the `timings` user property and summarized per scenario at the end of the run.
+"""
+
+import statistics
+
+from _pytest.reports import TestReport
+from _pytest.terminal import TerminalReporter
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from tests.selectors import APP_READY_PREDICATE, UPDATE_SETTLE_MS, UPDATE_WATCH_SCRIPT
+
+SCENARIOS = ('page_load', 'update_location')
+
+TIMER_SCRIPT = """
+(() => {
+	const timings = window.__e2eTimings = {page_load: null, update_location: []};
+	const ready = (%s);
+	const checkReady = () => {
+		if (document.readyState !== 'loading' && ready()) {
+			timings.page_load = performance.now();
+		} else {
+			setTimeout(checkReady, 25);
+		}
+	};
+	checkReady();
+
+	const watch = (%s);
+	// Capturing listener: runs before the app's own click handler, so the watcher sees the state the click changes.
+	document.addEventListener('click', event => {
+		const button = event.target.closest && event.target.closest('button');
+		if (!button || button.textContent.trim() !== 'Update location') {
+			return;
+		}
+		watch(%%d, %%d).then(({outcome, renderMs}) => timings.update_location.push({ms: renderMs, outcome}));
+	}, true);
+})();
+""" % (APP_READY_PREDICATE.strip(), UPDATE_WATCH_SCRIPT.strip())
+
+_READ_SCRIPT = "return window.__e2eTimings || null;"
+
+
+def apply(driver: WebDriver, rate: float, timeout: int) -> None:
+	"""Throttle the driver's current page and install the timer for every document it loads from now on.
+
+	`timeout` (seconds, already scaled to the slowdown) bounds how long the timer watches one click.
+	"""
+	if rate > 1:
+		driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': rate})
+	source = TIMER_SCRIPT % (timeout * 1000, UPDATE_SETTLE_MS)
+	driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+
+
+def read(driver: WebDriver) -> dict[str, list[float]]:
+	"""Milliseconds per scenario on the current page; updates that showed an alert or timed out are left out."""
+	try:
+		timings = driver.execute_script(_READ_SCRIPT)
+	except WebDriverException:
+		return {}
+	if not timings:
+		return {}
+
+	return {
+		'page_load': [round(timings['page_load'], 1)] if timings['page_load'] is not None else [],
+		'update_location': [
+			round(update['ms'], 1)
+			for update in timings['update_location']
+			if update['outcome'] in ('rendered', 'unchanged')
+		],
+	}
+
+
+def scaled_timeout(timeout: int, rate: float | None) -> int:
+	return round(timeout * max(rate or 1, 1))
+
+
+class CpuTimings:
+	"""pytest plugin: collects the `timings` user property of every test and summarizes it per scenario."""
+
+	def __init__(self, rate: float) -> None:
+		self.rate = rate
+		self.timings: dict[str, list[tuple[str, float]]] = {scenario: [] for scenario in SCENARIOS}
+
+	def pytest_runtest_logreport(self, report: TestReport) -> None:
+		if report.when != 'teardown':
+			return
+
+		for name, value in report.user_properties:
+			if name == 'timings':
+				for scenario, samples in value.items():
+					self.timings[scenario] += [(report.nodeid, sample) for sample in samples]
+
+	def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+		if not any(self.timings.values()):
+			return
+
+		terminalreporter.section(f'timings at {self.rate:g}x CPU slowdown')
+		for scenario, samples in self.timings.items():
+			if not samples:
+				continue
+
+			values = sorted(sample for _, sample in samples)
+			p90 = values[min(len(values) - 1, int(len(values) * 0.9))]
+			slowest_test, slowest = max(samples, key=lambda entry: entry[1])
+			terminalreporter.write_line(
+				f"{scenario:<16} n={len(values):<4} median {statistics.median(values):8.0f} ms  p90 {p90:8.0f} ms  "
+				f"max {slowest:8.0f} ms  ({slowest_test})"
+			)
@@ -0,0 +1,260 @@
+import glob
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+# Trace Event Format: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+# Timestamps are microseconds on the wall clock, so spans from every worker process line up in one timeline.
+
+TESTS_TRACK = 0
+
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_PAGE_TIMELINE_SCRIPT = """
+const [navigation] = performance.getEntriesByType('navigation');
+return {
+	timeOrigin: performance.timeOrigin,
+	navigation: navigation ? navigation.toJSON() : null,
+	resources: performance.getEntriesByType('resource').map(entry => ({
+		name: entry.name,
+		initiatorType: entry.initiatorType,
+		startTime: entry.startTime,
+		duration: entry.duration,
+	})),
+};
+"""
+
+_NAVIGATION_PHASES = (
+	('redirect', 'redirectStart', 'redirectEnd'),
+	('dns', 'domainLookupStart', 'domainLookupEnd'),
+	('connect', 'connectStart', 'connectEnd'),
+	('request', 'requestStart', 'responseStart'),
+	('response', 'responseStart', 'responseEnd'),
+	('dom interactive', 'responseEnd', 'domInteractive'),
+	('DOMContentLoaded', 'domContentLoadedEventStart', 'domContentLoadedEventEnd'),
+	('load', 'loadEventStart', 'loadEventEnd'),
+)
+
+
+def now_us() -> float:
+	return (time.perf_counter_ns() + _EPOCH_OFFSET_NS) / 1000
+
+
+class TraceRecorder:
+	def __init__(self, path: str, worker: str | None = None) -> None:
+		self.path = path
+		self.worker = worker
+		self.pid = int(worker[2:]) + 1 if worker and worker.startswith('gw') else 0
+		self.events: list[dict[str, Any]] = []
+		self._track_ids = itertools.count(TESTS_TRACK + 1)
+		self._async_ids = itertools.count(1)
+		self._driver_tracks: dict[int, int] = {}
+
+		self._metadata('process_name', TESTS_TRACK, {'name': f"worker {worker or 'main'}"})
+		self._metadata('process_sort_index', TESTS_TRACK, {'sort_index': self.pid})
+		self._metadata('thread_name', TESTS_TRACK, {'name': 'tests'})
+
+	def _metadata(self, name: str, tid: int, args: dict[str, Any]) -> None:
+		self.events.append({'ph': 'M', 'name': name, 'pid': self.pid, 'tid': tid, 'args': args})
+
+	def new_track(self, name: str) -> int:
+		tid = next(self._track_ids)
+		self._metadata('thread_name', tid, {'name': name})
+		self._metadata('thread_sort_index', tid, {'sort_index': tid})
+		return tid
+
+	def bind_driver(self, driver: WebDriver, tid: int) -> None:
+		self._driver_tracks[id(driver)] = tid
+
+	def track_for(self, driver: object) -> int:
+		return self._driver_tracks.get(id(driver), TESTS_TRACK)
+
+	def complete(self, name: str, cat: str, tid: int, start: float, end: float, args: dict | None = None) -> None:
+		event = {'ph': 'X', 'name': name, 'cat': cat, 'pid': self.pid, 'tid': tid, 'ts': start, 'dur': end - start}
+		if args:
+			event['args'] = args
+		self.events.append(event)
+
+	def async_complete(self, name: str, cat: str, start: float, end: float, args: dict | None = None) -> None:
+		# Overlapping in-page work (parallel resource loads) cannot share a thread track, so it goes on async tracks.
+		event = {'name': name, 'cat': cat, 'pid': self.pid, 'tid': TESTS_TRACK, 'id': next(self._async_ids)}
+		self.events.append({**event, 'ph': 'b', 'ts': start, 'args': args or {}})
+		self.events.append({**event, 'ph': 'e', 'ts': end})
+
+	def write(self) -> str:
+		path = f'{self.path}.{self.worker}.part' if self.worker else self.path
+		with open(path, 'w') as file:
+			json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, file)
+		return path
+
+
+_recorder: TraceRecorder | None = None
+
+# Spans of the running test as [name, cat, start_us, end_us], kept even without a trace file while a step log is on.
+_steps: list[list] | None = None
+
+
+def start(path: str, worker: str | None = None) -> TraceRecorder:
+	global _recorder
+	_recorder = TraceRecorder(path, worker)
+	return _recorder
+
+
+def stop() -> str | None:
+	global _recorder
+	if _recorder is None:
+		return None
+
+	path = _recorder.write()
+	_recorder = None
+	return path
+
+
+def enabled() -> bool:
+	return _recorder is not None
+
+
+def merge_parts(path: str) -> str | None:
+	parts = sorted(glob.glob(f'{glob.escape(path)}.*.part'))
+	if not parts:
+		return None
+
+	events = []
+	for part in parts:
+		with open(part) as file:
+			events.extend(json.load(file)['traceEvents'])
+		os.remove(part)
+
+	with open(path, 'w') as file:
+		json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+	return path
+
+
+def new_browser_track(label: str) -> int:
+	if _recorder is None:
+		return TESTS_TRACK
+	return _recorder.new_track(f'browser: {label}')
+
+
+def bind_driver(driver: WebDriver, tid: int) -> None:
+	if _recorder is not None:
+		_recorder.bind_driver(driver, tid)
+
+
+def track_for(driver: object) -> int:
+	if _recorder is None:
+		return TESTS_TRACK
+	return _recorder.track_for(driver)
+
+
+def start_steps() -> None:
+	global _steps
+	_steps = []
+
+
+def stop_steps() -> list[list]:
+	global _steps
+	steps, _steps = _steps or [], None
+	return steps
+
+
+def steps() -> list[list]:
+	return _steps or []
+
+
+@contextmanager
+def span(name: str, cat: str, tid: int = TESTS_TRACK, args: dict | None = None) -> Iterator[None]:
+	if _recorder is None and _steps is None:
+		yield
+		return
+
+	recorder = _recorder
+	start_ts = now_us()
+	step = [name, cat, start_ts, None]
+	if _steps is not None:
+		_steps.append(step)
+	try:
+		yield
+	finally:
+		step[3] = now_us()
+		if recorder is not None:
+			recorder.complete(name, cat, tid, start_ts, step[3], args)
+
+
+def traced(cat: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""Record every call of the decorated function as a span on the track of its `driver` argument."""
+
+	def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+		@wraps(func)
+		def wrapper(driver: WebDriver, *args, **kwargs):
+			if _recorder is None and _steps is None:
+				return func(driver, *args, **kwargs)
+
+			with span(func.__name__, cat, track_for(driver)):
+				return func(driver, *args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+def instrument_selenium() -> None:
+	"""Wrap WebDriver commands and `WebDriverWait` polling so they show up as spans without touching the tests."""
+	execute = WebDriver.execute
+	until = WebDriverWait.until
+	until_not = WebDriverWait.until_not
+
+	@wraps(execute)
+	def traced_execute(self: WebDriver, driver_command: str, params: dict | None = None) -> dict:
+		with span(driver_command, 'webdriver', track_for(self)):
+			return execute(self, driver_command, params)
+
+	@wraps(until)
+	def traced_until(self: WebDriverWait, method: Callable[[WebDriver], Any], message: str = '') -> Any:  # noqa: ANN401
+		with span('WebDriverWait.until', 'wait', track_for(self._driver), {'timeout': self._timeout}):
+			return until(self, method, message)
+
+	@wraps(until_not)
+	def traced_until_not(
+		self: WebDriverWait, method: Callable[[WebDriver], Any], message: str = ''
+	) -> Any:  # noqa: ANN401
+		with span('WebDriverWait.until_not', 'wait', track_for(self._driver), {'timeout': self._timeout}):
+			return until_not(self, method, message)
+
+	WebDriver.execute = traced_execute
+	WebDriverWait.until = traced_until
+	WebDriverWait.until_not = traced_until_not
+
+
+def record_page_timeline(driver: WebDriver) -> None:
+	"""Copy the page's navigation and resource timings into the trace, converted to the shared clock."""
+	if _recorder is None:
+		return
+
+	timeline = driver.execute_script(_PAGE_TIMELINE_SCRIPT)
+	origin_us = timeline['timeOrigin'] * 1000
+	navigation = timeline['navigation']
+	cat = f'page.{track_for(driver)}'
+
+	if navigation:
+		for name, start_key, end_key in _NAVIGATION_PHASES:
+			start_ms, end_ms = navigation.get(start_key, 0), navigation.get(end_key, 0)
+			if start_ms and end_ms >= start_ms:
+				_recorder.async_complete(name, cat, origin_us + start_ms * 1000, origin_us + end_ms * 1000)
+
+	for resource in timeline['resources']:
+		start_us = origin_us + resource['startTime'] * 1000
+		_recorder.async_complete(
+			resource['name'].rsplit('/', 1)[-1] or resource['name'],
+			cat,
+			start_us,
+			start_us + resource['duration'] * 1000,
+			{'url': resource['name'], 'initiatorType': resource['initiatorType']},
+		)
@@ -50,7 +50,7 @@ def create_random_non_float(length: int = 10) -> str:
 			return result
 
 
-def get_dynamic_days_order() -> list[str]:
+def get_dynamic_days_order(now: datetime | None = None) -> list[str]:
 	days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-	today = datetime.now().weekday()
+	today = (now or datetime.now()).weekday()
 	return days[today:] + days[:today]
@@ -0,0 +1,425 @@
+"""Data invariants of the weather page, checked against page snapshots without a browser.
+
+The read-only tests run these rules against the live snapshot fixtures. With `--record-snapshots PATH` every
+snapshot the fixtures capture is also appended to an NDJSON file, and the recorded corpus can be re-validated
+whenever a rule changes:
+
+    python -m tests.validation snapshots.ndjson --rule forecast_dates --jobs 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+
+from tests.browser import GEOLOCATION_ALLOW, GEOLOCATION_BLOCK
+from tests.snapshot import PageSnapshot, Span
+from tests.utils import get_dynamic_days_order
+
+PERMISSIONS = {
+	GEOLOCATION_ALLOW: 'allow',
+	GEOLOCATION_BLOCK: 'block',
+}
+
+FORECAST_ROW_NAMES = ('Date', 'Weather', 'Max [°C]', 'Min [°C]', 'Generated\nenergy [kWh]')
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+	snapshot: PageSnapshot
+	recorded_at: float
+	permission: str | None = None
+	url: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+	rule: str
+	message: str
+
+
+Rule = Callable[[Record], Iterator[str]]
+
+RULES: dict[str, Rule] = {}
+
+
+def rule(name: str) -> Callable[[Rule], Rule]:
+	def register(check: Rule) -> Rule:
+		RULES[name] = check
+		return check
+
+	return register
+
+
+def _float(text: str) -> float | None:
+	try:
+		return float(text)
+	except ValueError:
+		return None
+
+
+def _forecast_row(record: Record, index: int) -> Iterator[tuple[int, object]]:
+	rows = record.snapshot.table_rows
+	if len(rows) <= abs(index):
+		yield 0, f"Expected 5 rows in tbody, but found {len(rows)}"
+		return
+
+	cells = rows[index].cells
+	if len(cells) != 7:
+		yield 0, f"Expected 7 columns, but found {len(cells)}"
+		return
+
+	for column, cell in enumerate(cells, start=1):
+		if not cell.displayed:
+			yield 0, f"Column {column} is not visible"
+		yield column, cell
+
+
+def _numeric_row(record: Record, index: int, check: Callable[[int, float], str | None]) -> Iterator[str]:
+	for column, cell in _forecast_row(record, index):
+		if not column:
+			yield cell
+		elif not cell.text:
+			yield f"Column {column}  has no text"
+		elif (value := _float(cell.text)) is None:
+			yield f"Column {column} contains non-numeric value: '{cell.text}'"
+		elif message := check(column, value):
+			yield message
+
+
+@rule('forecast_table')
+def check_forecast_table(record: Record) -> Iterator[str]:
+	headers = record.snapshot.table_headers
+	if len(headers) != 7:
+		yield f"Expected 7 table headers, but found {len(headers)}"
+
+	days = get_dynamic_days_order(datetime.fromtimestamp(record.recorded_at))
+	days_from_table = [th.text for th in headers]
+	if days_from_table != days:
+		yield f"Expected days: {days}, but got: {days_from_table}"
+
+	rows = record.snapshot.table_rows
+	if len(rows) != 5:
+		yield f"Expected 5 rows in tbody, but found {len(rows)}"
+
+	for idx, (row, expected_row_name) in enumerate(zip(rows, FORECAST_ROW_NAMES)):
+		if row.header != expected_row_name:
+			yield f"Row {idx + 1} header mismatch: expected '{expected_row_name}', but got '{row.header}'"
+
+
+@rule('forecast_dates')
+def check_forecast_dates(record: Record) -> Iterator[str]:
+	for column, cell in _forecast_row(record, 0):
+		if not column:
+			yield cell
+			continue
+		if not cell.text:
+			yield f"Column {column}  has no text"
+			continue
+
+		date_parts = cell.text.split('/')
+		if len(date_parts) != 3 or not all(part.isdigit() for part in date_parts):
+			yield f"Date '{cell.text}' is not in DD/MM/YYYY format"
+			continue
+
+		day, month, year = map(int, date_parts)
+		if not 1 <= day <= 31:
+			yield f"Day '{day}' is out of range"
+		if not 1 <= month <= 12:
+			yield f"Month '{month}' is out of range"
+		if year <= 2000:
+			yield f"Year '{year}' is out of range"
+
+
+@rule('forecast_weather_icons')
+def check_forecast_weather_icons(record: Record) -> Iterator[str]:
+	for column, cell in _forecast_row(record, 1):
+		if not column:
+			yield cell
+		elif not cell.icons:
+			yield f"No SVG icon found in column {column}"
+		elif not cell.icons[0].displayed:
+			yield f"SVG icon in column {column} is not visible"
+
+
+def _temperature(column: int, value: float) -> str | None:
+	return None if -95 <= value <= 60 else f"Temperature in column {column} is out of range: {value}"
+
+
+@rule('forecast_max_temperatures')
+def check_forecast_max_temperatures(record: Record) -> Iterator[str]:
+	yield from _numeric_row(record, 2, _temperature)
+
+
+@rule('forecast_min_temperatures')
+def check_forecast_min_temperatures(record: Record) -> Iterator[str]:
+	yield from _numeric_row(record, 3, _temperature)
+
+
+@rule('forecast_energy')
+def check_forecast_energy(record: Record) -> Iterator[str]:
+	yield from _numeric_row(
+		record, -1, lambda column, value: None if value >= 0 else f"Energy in column {column} is negative: {value}"
+	)
+
+
+@rule('summary_items')
+def check_summary_items(record: Record) -> Iterator[str]:
+	items = record.snapshot.summary
+	if len(items) != 4:
+		yield f"Expected 4 inner divs, but found {len(items)}"
+
+	for idx, item in enumerate(items):
+		if not item.displayed:
+			yield f"Inner div {idx + 1} is not visible"
+		if not item.text.strip():
+			yield f"Inner div {idx + 1} has no text"
+
+
+def _summary_span(record: Record, item: int, name: str, icon: str) -> tuple[list[str], Span | None]:
+	items = record.snapshot.summary
+	if len(items) != 4 or not items[item].spans:
+		return [f"No {name} span in the week summary"], None
+
+	span = items[item].spans[0]
+	messages = []
+	if not span.displayed:
+		messages.append(f"{name.capitalize()} span is not visible")
+	if not span.icons:
+		messages.append(f"No SVG icon found in {name} span")
+	else:
+		if not span.icons[0].displayed:
+			messages.append(f"{name.capitalize()} SVG icon is not visible")
+		if span.icons[0].name != icon:
+			messages.append(f"Unexpected icon in {name} span: {span.icons[0].name}")
+
+	return messages, span
+
+
+@rule('summary_temperatures')
+def check_summary_temperatures(record: Record) -> Iterator[str]:
+	items = record.snapshot.summary
+	spans = items[0].spans if items else ()
+	if len(spans) != 2:
+		yield f"Expected 2 spans, but found {len(spans)}"
+		return
+
+	for span, label, icon in zip(spans, ('Max:', 'Min:'), ('temperature-full', 'temperature-empty')):
+		if not span.displayed:
+			yield f"{label} span is not visible"
+		if not span.icons:
+			yield f"No SVG icon found in {label} span"
+		else:
+			if not span.icons[0].displayed:
+				yield f"SVG in {label} span is not visible"
+			if span.icons[0].name != icon:
+				yield f"Unexpected icon in {label} temperature: {span.icons[0].name}"
+
+		parts = span.text.split(' ')
+		if parts[0] != label:
+			yield f"Expected '{label}' but found {parts[0]}"
+		if len(parts) < 2 or _float(parts[1]) is None:
+			yield f"{label} temperature value is not a float: {parts[1:2]}"
+		if parts[-1] != '[°C]':
+			yield f"Expected '[°C]' but found {parts[-1]}"
+
+
+@rule('summary_pressure')
+def check_summary_pressure(record: Record) -> Iterator[str]:
+	messages, span = _summary_span(record, 1, 'pressure', 'arrows-down-to-line')
+	yield from messages
+	if span is None:
+		return
+
+	parts = span.text.split(' ')
+	if len(parts) != 2:
+		yield f"Pressure text is not in expected format: {parts}"
+		return
+	if _float(parts[0]) is None:
+		yield f"Pressure value is not a float: {parts[0]}"
+	if parts[-1] != '[hPa]':
+		yield f"Expected '[hPa]' but found {parts[-1]}"
+
+
+@rule('summary_sunshine')
+def check_summary_sunshine(record: Record) -> Iterator[str]:
+	messages, span = _summary_span(record, 2, 'sunshine duration', 'solar-panel')
+	yield from messages
+	if span is None:
+		return
+
+	parts = span.text.split(' ')
+	if len(parts) != 2:
+		yield f"Sunshine duration text is not in expected format: {parts}"
+		return
+
+	hours, minutes = parts
+	if hours[-1:] != 'h' or not hours[:-1].isdigit():
+		yield f"Sunshine duration hours value is not '<int>h': {hours}"
+	if minutes[-3:] != 'min' or not minutes[:-3].isdigit():
+		yield f"Sunshine duration minutes value is not '<int>min': {minutes}"
+	elif not 0 <= int(minutes[:-3]) < 60:
+		yield f"Minutes value should be between 0 and 59, but found: {minutes[:-3]}"
+
+
+@rule('summary_description')
+def check_summary_description(record: Record) -> Iterator[str]:
+	messages, span = _summary_span(record, 3, 'weather description', 'circle-info')
+	yield from messages
+	if span is None:
+		return
+
+	if not span.paragraphs:
+		yield "Expected at least 1 paragraph in weather description, but found none"
+	for idx, paragraph in enumerate(span.paragraphs):
+		if not paragraph.displayed:
+			yield f"Paragraph {idx + 1} in weather description is not visible"
+		if not paragraph.text.strip():
+			yield f"Paragraph {idx + 1} in weather description is empty"
+
+
+@rule('default_location')
+def check_default_location(record: Record) -> Iterator[str]:
+	inputs = record.snapshot.selected_location
+	if len(inputs) != 2:
+		yield f"Expected 2 <input> elements, found {len(inputs)}"
+		return
+
+	for field in inputs:
+		if not field.displayed:
+			yield f"Element <input> is not visible: {field.text}"
+		if record.permission == 'allow' and field.text == '0':
+			yield f"Unexpected value in <input>: {field.text}"
+		elif record.permission == 'block' and field.text != '0':
+			yield f"Unexpected value in <input>: {field.text}"
+		if _float(field.text) is None:
+			yield f"<input> value is not a float: {field.text}"
+
+	selected = [_float(field.text) for field in inputs]
+	user = [_float(th.text) for th in record.snapshot.user_location]
+	if len(user) != 2:
+		yield f"Expected 2 <th> elements in user location, found {len(user)}"
+		return
+
+	for name, user_value, selected_value in zip(('Latitude', 'Longitude'), user, selected):
+		if user_value != selected_value:
+			yield f"{name} mismatch: {user_value} != {selected_value}"
+
+
+def validate(record: Record, names: Iterable[str] | None = None) -> list[Violation]:
+	violations = []
+	for name in names or RULES:
+		try:
+			violations.extend(Violation(name, message) for message in RULES[name](record))
+		except Exception as e:
+			# A malformed snapshot is a violation of that rule, not a reason to stop validating the corpus.
+			violations.append(Violation(name, f"rule raised {type(e).__name__}: {e}"))
+
+	return violations
+
+
+def assert_valid(snapshot: PageSnapshot, *names: str, permission: str | None = None) -> None:
+	violations = validate(Record(snapshot, time.time(), permission), names)
+	assert not violations, '\n'.join(violation.message for violation in violations)
+
+
+def to_line(record: Record) -> str:
+	return json.dumps(
+		{
+			'recorded_at': record.recorded_at,
+			'permission': record.permission,
+			'url': record.url,
+			'snapshot': asdict(record.snapshot),
+		},
+		ensure_ascii=False,
+		separators=(',', ':'),
+	)
+
+
+def from_line(line: str) -> Record:
+	data = json.loads(line)
+	return Record(PageSnapshot.from_dict(data['snapshot']), data['recorded_at'], data['permission'], data['url'])
+
+
+def record(path: str, snapshot: PageSnapshot, geolocation: int | None, url: str | None) -> None:
+	line = to_line(Record(snapshot, time.time(), PERMISSIONS.get(geolocation), url)) + '\n'
+	# One write per line on an O_APPEND descriptor, so xdist workers can share the file.
+	fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+	try:
+		os.write(fd, line.encode())
+	finally:
+		os.close(fd)
+
+
+def _validate_lines(batch: tuple[int, list[str], tuple[str, ...] | None]) -> list[tuple[int, Violation]]:
+	start, lines, names = batch
+	failures = []
+	for number, line in enumerate(lines, start=start):
+		if not line.strip():
+			continue
+		try:
+			violations = validate(from_line(line), names)
+		except (ValueError, KeyError, TypeError):
+			violations = [Violation('record', f"unreadable record: {traceback.format_exc(limit=0).strip()}")]
+		failures.extend((number, violation) for violation in violations)
+
+	return failures
+
+
+def _batches(path: str, names: tuple[str, ...] | None, size: int) -> Iterator[tuple[int, list[str], tuple]]:
+	with open(path, encoding='utf-8') as file:
+		start, lines = 1, []
+		for number, line in enumerate(file, start=1):
+			lines.append(line)
+			if len(lines) == size:
+				yield start, lines, names
+				start, lines = number + 1, []
+		if lines:
+			yield start, lines, names
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('path', help='NDJSON file written by pytest --record-snapshots.')
+	parser.add_argument(
+		'--rule', action='append', choices=sorted(RULES), help='Only run this rule (repeatable; default: all).'
+	)
+	parser.add_argument('--jobs', type=int, default=1, help='Validate in this many processes.')
+	parser.add_argument('--batch-size', type=int, default=2000, help='Records per unit of work.')
+	parser.add_argument('--show', type=int, default=20, help='Print at most this many violations.')
+	args = parser.parse_args()
+
+	names = tuple(args.rule) if args.rule else None
+	started = time.perf_counter()
+	batches = _batches(args.path, names, args.batch_size)
+	if args.jobs > 1:
+		with ProcessPoolExecutor(args.jobs) as executor:
+			failures = [failure for result in executor.map(_validate_lines, batches) for failure in result]
+	else:
+		failures = [failure for batch in batches for failure in _validate_lines(batch)]
+	elapsed = time.perf_counter() - started
+
+	with open(args.path, encoding='utf-8') as file:
+		total = sum(1 for line in file if line.strip())
+
+	for number, violation in failures[:args.show]:
+		print(f"{args.path}:{number}: [{violation.rule}] {violation.message}")
+
+	per_rule = Counter(violation.rule for _, violation in failures)
+	failed_records = len({number for number, _ in failures})
+	print(f"{total} records, {failed_records} with violations, {len(failures)} violations in {elapsed:.2f}s")
+	for name, count in per_rule.most_common():
+		print(f"  {name:<26} {count}")
+
+	sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+	main()
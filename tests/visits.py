@@ -0,0 +1,234 @@
+"""Compare a first visit with returning visits: cold load, warm reload and warm load in a new tab.
+
+Every run opens a fresh browser context (an empty HTTP cache) and measures the page load and an Update location
+three times in it: on the cold first visit, after reloading the same tab and in a second tab of the same context.
+For each case the network traffic is read from DevTools Network events (requests, bytes transferred, responses
+served from the browser cache, 304 revalidations) and the time until the forecast table is ready is taken in the
+page: from navigation start for the load, from the click for the update.
+
+    python -m tests.visits --runs 5 --output visits.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+from dataclasses import asdict, dataclass
+
+import trio
+from dotenv import load_dotenv
+from selenium.common import JavascriptException, TimeoutException, WebDriverException
+
+from tests import async_driver, launch
+from tests.browser import GEOLOCATION_BLOCK
+from tests.devtools import browser_websocket_url
+from tests.selectors import (
+	APP_READY_PREDICATE,
+	LATITUDE_INPUT_XPATH,
+	LONGITUDE_INPUT_XPATH,
+	update_location_script,
+)
+
+load_dotenv()
+url = os.getenv("URL")
+
+MODES = ('cold', 'warm_reload', 'warm_new_tab')
+SCENARIOS = ('page_load', 'update_location')
+
+# Resolves with the time since navigation start at which the app became ready.
+_READY_AT = f"() => ({APP_READY_PREDICATE.strip()})() && performance.now()"
+
+_NEW_DOCUMENT = (
+	"performance.timeOrigin !== {origin} && location.href !== 'about:blank' && document.readyState !== 'loading'"
+)
+
+_CACHE_FLAGS = ('fromDiskCache', 'fromPrefetchCache', 'fromServiceWorker')
+
+
+@dataclass
+class VisitResult:
+	run: int
+	mode: str
+	scenario: str
+	outcome: str
+	ready_ms: float | None = None
+	requests: int = 0
+	transferred_bytes: int = 0
+	cached: int = 0
+	revalidated: int = 0
+
+	@property
+	def hit_ratio(self) -> float | None:
+		return self.cached / self.requests if self.requests else None
+
+
+class Traffic:
+	"""Network events of one tab, taken phase by phase."""
+
+	def __init__(self, tab: async_driver.Tab) -> None:
+		self._channels = {
+			method: tab.listen(f'Network.{method}')
+			for method in ('responseReceived', 'requestServedFromCache', 'loadingFinished')
+		}
+
+	def _drain(self, method: str) -> list[dict]:
+		events = []
+		while True:
+			try:
+				events.append(self._channels[method].receive_nowait())
+			except trio.WouldBlock:
+				return events
+
+	def close(self) -> None:
+		for channel in self._channels.values():
+			channel.close()
+
+	def take(self) -> dict:
+		"""Requests, transferred bytes, cache hits and revalidations since the previous call."""
+		responses = {
+			event['requestId']: event['response']
+			for event in self._drain('responseReceived')
+			if not event['response']['url'].startswith('data:')
+		}
+		served = {event['requestId'] for event in self._drain('requestServedFromCache')}
+		finished = {event['requestId']: event['encodedDataLength'] for event in self._drain('loadingFinished')}
+
+		requests = set(responses) | served
+		return {
+			'requests': len(requests),
+			'transferred_bytes': int(sum(length for request, length in finished.items() if request in requests)),
+			'cached': sum(
+				request in served or any(responses.get(request, {}).get(flag) for flag in _CACHE_FLAGS)
+				for request in requests
+			),
+			'revalidated': sum(response['status'] == 304 for response in responses.values()),
+		}
+
+
+async def _load(tab: async_driver.Tab, reload: bool, timeout: int) -> float:
+	origin = await tab.evaluate('performance.timeOrigin')
+	if reload:
+		await tab.send('Page.reload')
+	else:
+		await tab.send('Page.navigate', {'url': url})
+
+	with trio.fail_after(timeout):
+		while True:
+			try:
+				if await tab.evaluate(_NEW_DOCUMENT.format(origin=origin)):
+					break
+			except (JavascriptException, WebDriverException):
+				# The old document's execution context goes away mid-navigation.
+				pass
+			await trio.sleep(0.025)
+
+	return await tab.wait_for(_READY_AT, timeout)
+
+
+async def measure_visit(
+		tab: async_driver.Tab, run: int, mode: str, location: tuple[float, float], settle: float, timeout: int
+) -> list[VisitResult]:
+	traffic = Traffic(tab)
+	await tab.send('Network.enable')
+	try:
+		try:
+			ready_ms = await _load(tab, mode == 'warm_reload', timeout)
+		except (TimeoutException, trio.TooSlowError):
+			return [VisitResult(run, mode, 'page_load', 'timeout', **traffic.take())]
+		await trio.sleep(settle)
+		results = [VisitResult(run, mode, 'page_load', 'ready', round(ready_ms, 1), **traffic.take())]
+
+		await tab.fill(LATITUDE_INPUT_XPATH, str(location[0]))
+		await tab.fill(LONGITUDE_INPUT_XPATH, str(location[1]))
+		try:
+			timing = await tab.evaluate(update_location_script(timeout), timeout + 5)
+		except (TimeoutException, trio.TooSlowError):
+			timing = {'outcome': 'timeout'}
+		await trio.sleep(settle)
+		outcome = timing.get('outcome', 'error')
+		render_ms = round(timing['renderMs'], 1) if outcome == 'rendered' else None
+		results.append(VisitResult(run, mode, 'update_location', outcome, render_ms, **traffic.take()))
+		return results
+	finally:
+		await tab.send('Network.disable')
+		traffic.close()
+
+
+async def compare(
+		websocket_url: str, runs: int, location: tuple[float, float], settle: float, timeout: int
+) -> list[VisitResult]:
+	results = []
+	async with async_driver.connect(websocket_url) as browser:
+		for run in range(1, runs + 1):
+			# Blocked geolocation keeps the selected location at its default, so the update always changes it.
+			async with browser.tab(GEOLOCATION_BLOCK) as tab:
+				results += await measure_visit(tab, run, 'cold', location, settle, timeout)
+				results += await measure_visit(tab, run, 'warm_reload', location, settle, timeout)
+				second = await browser.open_in(tab.context_id)
+				results += await measure_visit(second, run, 'warm_new_tab', location, settle, timeout)
+			print(f"[{run}/{runs}] done")
+
+	return results
+
+
+def summarize(results: list[VisitResult]) -> list[dict]:
+	def median(values: list[float]) -> float | None:
+		return round(statistics.median(values), 3) if values else None
+
+	summary = []
+	for scenario in SCENARIOS:
+		for mode in MODES:
+			members = [result for result in results if result.scenario == scenario and result.mode == mode]
+			if not members:
+				continue
+			summary.append({
+				'scenario': scenario,
+				'mode': mode,
+				'runs': len(members),
+				'failed': sum(member.ready_ms is None for member in members),
+				'ready_ms': median([member.ready_ms for member in members if member.ready_ms is not None]),
+				'requests': median([member.requests for member in members]),
+				'transferred_kb': median([member.transferred_bytes / 1024 for member in members]),
+				'hit_ratio': median([member.hit_ratio for member in members if member.hit_ratio is not None]),
+				'revalidated': median([member.revalidated for member in members]),
+			})
+
+	return summary
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=3, help='Fresh browser contexts to measure (medians are shown).')
+	parser.add_argument('--latitude', type=float, default=52.2297, help='Location entered for Update location.')
+	parser.add_argument('--longitude', type=float, default=21.0122)
+	parser.add_argument('--settle', type=float, default=0.5, help='Seconds to let late requests finish.')
+	parser.add_argument('--timeout', type=int, default=15)
+	parser.add_argument('--output', default=None, help='Also write every measurement and the medians to JSON.')
+	parser.add_argument('--headed', action='store_true', help='Launch a visible browser window.')
+	args = parser.parse_args()
+
+	driver = launch.new_session(headless=not args.headed)
+	try:
+		results = trio.run(
+			compare, browser_websocket_url(driver), args.runs, (args.latitude, args.longitude), args.settle,
+			args.timeout,
+		)
+	finally:
+		driver.quit()
+		launch.shutdown()
+
+	summary = summarize(results)
+	columns = ('ready_ms', 'requests', 'transferred_kb', 'hit_ratio', 'revalidated', 'failed')
+	print(f"{'scenario':<16} {'mode':<13} " + ' '.join(f"{column:>14}" for column in columns))
+	for row in summary:
+		cells = ' '.join(f"{'-' if row[column] is None else row[column]:>14}" for column in columns)
+		print(f"{row['scenario']:<16} {row['mode']:<13} {cells}")
+
+	if args.output:
+		with open(args.output, 'w') as file:
+			measurements = [{**asdict(result), 'hit_ratio': result.hit_ratio} for result in results]
+			json.dump({'summary': summary, 'measurements': measurements}, file, indent='\t')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,321 @@
+"""Visual regression check over tiled region screenshots.
+
+Each region (the forecast table, the week summary) is captured once with `Page.captureScreenshot`, clipped to the
+element. Before the capture, everything in the region that comes from the live forecast or the current date (day
+names, dates, weather icons, temperatures, the figures of the week summary) is drawn as a flat box of a fixed size,
+so neither the weather nor the width of a number can change the pixels or the layout. The capture is split into
+`TILE_SIZE` tiles and each tile is hashed; only tiles whose hash differs from the baseline are decoded from the
+baseline PNG and compared pixel by pixel, within the region's per-channel `tolerance` and the share of pixels
+(`max_changed_ratio`) a tile may differ by.
+
+Baselines (`<region>.png` and `<region>.json` with the tile hashes) live in `tests/visual_baselines/` and are
+written with `pytest --update-visual-baselines` on the machine that runs the check; the test is skipped for a region
+without one. PNG is decoded and encoded here in pure Python (8-bit RGB and RGBA, non-interlaced, which is what
+Chrome produces).
+"""
+
+import base64
+import hashlib
+import json
+import struct
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+BASELINE_DIR = Path(__file__).parent / 'visual_baselines'
+
+TILE_SIZE = 32
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+_MASK_SCRIPT = """
+const [selector, masks, [width, height]] = arguments;
+const region = document.querySelector(selector);
+if (!region) {
+	return null;
+}
+const masked = window.__e2eVisualMasks = [];
+const sheet = document.createElement('style');
+sheet.textContent = '[data-e2e-visual-mask] * {visibility: hidden !important;}';
+document.head.append(sheet);
+masked.push([sheet, null]);
+for (const mask of masks) {
+	for (const element of region.querySelectorAll(mask)) {
+		masked.push([element, element.getAttribute('style')]);
+		element.setAttribute('data-e2e-visual-mask', '');
+		// A flat box of the same size whatever the element held, so live text and icons cannot move the layout.
+		if (!getComputedStyle(element).display.startsWith('table')) {
+			element.style.setProperty('display', 'inline-block', 'important');
+		}
+		for (const [property, value] of [
+			['font-size', '0'], ['line-height', '0'], ['overflow', 'hidden'], ['background', '#808080'],
+			['width', `${width}px`], ['min-width', `${width}px`], ['max-width', `${width}px`],
+			['height', `${height}px`], ['padding', '0'],
+		]) {
+			element.style.setProperty(property, value, 'important');
+		}
+	}
+}
+region.scrollIntoView({block: 'nearest'});
+const rect = region.getBoundingClientRect();
+return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+"""
+
+_UNMASK_SCRIPT = """
+for (const [element, style] of window.__e2eVisualMasks || []) {
+	if (element.tagName === 'STYLE') {
+		element.remove();
+		continue;
+	}
+	element.removeAttribute('data-e2e-visual-mask');
+	if (style === null) {
+		element.removeAttribute('style');
+	} else {
+		element.setAttribute('style', style);
+	}
+}
+window.__e2eVisualMasks = [];
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Region:
+	name: str
+	selector: str
+	# Selectors inside the region whose elements are drawn as flat `mask_box` (width, height) boxes before the
+	# capture: everything that comes from the live forecast or the current date, text and icons alike.
+	masks: tuple[str, ...] = ()
+	mask_box: tuple[int, int] = (64, 20)
+	tolerance: int = 16
+	max_changed_ratio: float = 0.01
+
+
+REGIONS = (
+	Region(
+		'forecast_table',
+		'div.overflow-x-auto table',
+		# The day names and every body cell after the row names: dates, weather icons, temperatures, energy.
+		masks=('tr:first-child .align-middle', 'tbody th:not(:first-child)'),
+	),
+	Region(
+		'week_summary',
+		'div.row.mb-3:has(div.col-12.col-md-6.col-lg-3)',
+		# Each item's span holds its icon and the figures of the week.
+		masks=('span',),
+		mask_box=(160, 48),
+	),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Image:
+	width: int
+	height: int
+	channels: int
+	rows: tuple[bytes, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Baseline:
+	width: int
+	height: int
+	tile_size: int
+	hashes: list[list[str]]
+	load_image: Callable[[], Image]
+
+
+def _unfilter(filter_type: int, line: bytearray, prior: bytes, bpp: int) -> None:
+	length = len(line)
+	if filter_type == 0:
+		return
+	if filter_type == 1:
+		for i in range(bpp, length):
+			line[i] = (line[i] + line[i - bpp]) & 0xFF
+	elif filter_type == 2:
+		line[:] = bytes((value + above) & 0xFF for value, above in zip(line, prior))
+	elif filter_type == 3:
+		for i in range(length):
+			left = line[i - bpp] if i >= bpp else 0
+			line[i] = (line[i] + ((left + prior[i]) >> 1)) & 0xFF
+	elif filter_type == 4:
+		for i in range(length):
+			a = line[i - bpp] if i >= bpp else 0
+			b = prior[i]
+			c = prior[i - bpp] if i >= bpp else 0
+			p = a + b - c
+			pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+			line[i] = (line[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+	else:
+		raise ValueError(f"Unknown PNG filter type {filter_type}")
+
+
+def decode_png(data: bytes) -> Image:
+	if not data.startswith(PNG_SIGNATURE):
+		raise ValueError('Not a PNG file')
+
+	position = len(PNG_SIGNATURE)
+	header = None
+	compressed = []
+	while position < len(data):
+		length, kind = struct.unpack('>I4s', data[position:position + 8])
+		body = data[position + 8:position + 8 + length]
+		position += length + 12
+		if kind == b'IHDR':
+			header = struct.unpack('>IIBBBBB', body)
+		elif kind == b'IDAT':
+			compressed.append(body)
+		elif kind == b'IEND':
+			break
+
+	if header is None:
+		raise ValueError('PNG without IHDR chunk')
+	width, height, depth, color_type, _, _, interlace = header
+	if depth != 8 or color_type not in (2, 6) or interlace:
+		raise ValueError(f"Unsupported PNG: bit depth {depth}, color type {color_type}, interlace {interlace}")
+
+	channels = 3 if color_type == 2 else 4
+	stride = width * channels
+	raw = zlib.decompress(b''.join(compressed))
+	rows = []
+	prior = bytes(stride)
+	for y in range(height):
+		start = y * (stride + 1)
+		line = bytearray(raw[start + 1:start + 1 + stride])
+		_unfilter(raw[start], line, prior, channels)
+		prior = bytes(line)
+		rows.append(prior)
+
+	return Image(width, height, channels, tuple(rows))
+
+
+def encode_png(image: Image) -> bytes:
+	def chunk(kind: bytes, body: bytes) -> bytes:
+		return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+	color_type = 2 if image.channels == 3 else 6
+	header = struct.pack('>IIBBBBB', image.width, image.height, 8, color_type, 0, 0, 0)
+	raw = b''.join(b'\x00' + row for row in image.rows)
+	return PNG_SIGNATURE + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b'')
+
+
+def tile_hashes(image: Image, size: int = TILE_SIZE) -> list[list[str]]:
+	hashes = []
+	for top in range(0, image.height, size):
+		band = image.rows[top:top + size]
+		row_hashes = []
+		for left in range(0, image.width, size):
+			start, end = left * image.channels, min(left + size, image.width) * image.channels
+			digest = hashlib.blake2b(digest_size=8)
+			for row in band:
+				digest.update(row[start:end])
+			row_hashes.append(digest.hexdigest())
+		hashes.append(row_hashes)
+
+	return hashes
+
+
+def capture(driver: WebDriver, region: Region) -> Image:
+	rect = driver.execute_script(_MASK_SCRIPT, region.selector, list(region.masks), list(region.mask_box))
+	if rect is None:
+		raise AssertionError(f"Region {region.name} ({region.selector}) not found")
+
+	try:
+		screenshot = driver.execute_cdp_cmd('Page.captureScreenshot', {
+			'format': 'png',
+			'clip': {**rect, 'scale': 1},
+			'captureBeyondViewport': True,
+			'optimizeForSpeed': True,
+		})
+	finally:
+		driver.execute_script(_UNMASK_SCRIPT)
+
+	return decode_png(base64.b64decode(screenshot['data']))
+
+
+def save_baseline(region: Region, image: Image, directory: Path = BASELINE_DIR) -> None:
+	directory.mkdir(parents=True, exist_ok=True)
+	(directory / f'{region.name}.png').write_bytes(encode_png(image))
+	with open(directory / f'{region.name}.json', 'w') as file:
+		json.dump({
+			'width': image.width, 'height': image.height, 'tile_size': TILE_SIZE, 'hashes': tile_hashes(image)
+		}, file, indent='\t')
+
+
+def load_baseline(region: Region, directory: Path = BASELINE_DIR) -> Baseline | None:
+	hashes_path, image_path = directory / f'{region.name}.json', directory / f'{region.name}.png'
+	if not hashes_path.exists() or not image_path.exists():
+		return None
+
+	with open(hashes_path) as file:
+		stored = json.load(file)
+	return Baseline(
+		stored['width'],
+		stored['height'],
+		stored['tile_size'],
+		stored['hashes'],
+		lambda: decode_png(image_path.read_bytes()),
+	)
+
+
+def _changed_pixels(
+		actual: Image, expected: Image, left: int, top: int, size: int, tolerance: int
+) -> list[tuple[int, int]]:
+	channels = actual.channels
+	changed = []
+	for y in range(top, min(top + size, actual.height)):
+		actual_row, expected_row = actual.rows[y], expected.rows[y]
+		for x in range(left, min(left + size, actual.width)):
+			offset = x * channels
+			if any(
+				abs(actual_row[offset + channel] - expected_row[offset + channel]) > tolerance
+				for channel in range(channels)
+			):
+				changed.append((x, y))
+
+	return changed
+
+
+def compare(region: Region, actual: Image, baseline: Baseline) -> tuple[list[str], Image | None]:
+	"""Problems found and, when tiles differ beyond tolerance, the capture with the changed pixels in red."""
+	if (actual.width, actual.height) != (baseline.width, baseline.height):
+		return [
+			f"{region.name}: size {actual.width}x{actual.height} differs from the baseline "
+			f"{baseline.width}x{baseline.height}"
+		], None
+
+	size = baseline.tile_size
+	hashes = tile_hashes(actual, size)
+	differing = [
+		(column, row)
+		for row, row_hashes in enumerate(hashes)
+		for column, tile_hash in enumerate(row_hashes)
+		if tile_hash != baseline.hashes[row][column]
+	]
+	if not differing:
+		return [], None
+
+	expected = baseline.load_image()
+	if expected.channels != actual.channels:
+		return [f"{region.name}: baseline has {expected.channels} channels, the capture {actual.channels}"], None
+
+	problems = []
+	highlighted: list[tuple[int, int]] = []
+	for column, row in differing:
+		left, top = column * size, row * size
+		changed = _changed_pixels(actual, expected, left, top, size, region.tolerance)
+		pixels = (min(left + size, actual.width) - left) * (min(top + size, actual.height) - top)
+		if len(changed) > pixels * region.max_changed_ratio:
+			problems.append(f"{region.name}: tile at ({left}, {top}) differs in {len(changed)} of {pixels} pixels")
+			highlighted += changed
+
+	if not problems:
+		return [], None
+
+	rows = [bytearray(row) for row in actual.rows]
+	red = b'\xff\x00\x00\xff'[:actual.channels]
+	for x, y in highlighted:
+		rows[y][x * actual.channels:(x + 1) * actual.channels] = red
+	return problems, Image(actual.width, actual.height, actual.channels, tuple(bytes(row) for row in rows))